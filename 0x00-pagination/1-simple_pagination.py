@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """Pagination"""
 import csv
-from typing import List
+from typing import List, Sequence
+
+from row_index import RowIndex
 
 
 def index_range(page: int, page_size: int) -> tuple:
@@ -24,18 +26,29 @@ class Server:
 
     DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
-        """Initialize the Server with no dataset loaded."""
+    def __init__(self, storage: str = "list"):
+        """Initialize the Server with no dataset loaded.
+
+        Args:
+            storage (str): "list" parses the whole CSV into memory,
+                "mmap" indexes row offsets and parses rows on demand.
+        """
+        assert storage in ("list", "mmap"), "Unknown storage mode."
+        self.storage = storage
         self.__dataset = None
 
-    def dataset(self) -> List[List[str]]:
+    def dataset(self) -> Sequence[List[str]]:
         """Loads and caches the dataset from the CSV file.
 
         Returns:
-            List[List[str]]: The cached dataset.
+            Sequence[List[str]]: The cached dataset, or a RowIndex
+            over the file in "mmap" storage.
         """
         if self.__dataset is None:
             try:
+                if self.storage == "mmap":
+                    self.__dataset = RowIndex(self.DATA_FILE)
+                    return self.__dataset
                 with open(self.DATA_FILE, newline='', encoding='utf-8') as f:
                     reader = csv.reader(f)
                     self.__dataset = [row for row in reader][1:]  # Skip header
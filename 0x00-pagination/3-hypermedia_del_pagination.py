@@ -1,8 +1,25 @@
 #!/usr/bin/env python3
 """pagination"""
 import csv
+import io
+import itertools
 import math
-from typing import List, Dict, Any, Tuple
+import os
+import threading
+from typing import (List, Sequence, Dict, Any, Iterator, Optional, Tuple,
+                    Union)
+
+from aggregates import DistinctCounter, RangeStats
+from columnar import ColumnarStore
+from compressed import CompressedRowIndex, compression, open_text
+from live_index import LiveIndex
+from page_view import PageView
+from parallel_ingest import parse_parallel
+from prefetch import prefetch
+from row_index import RowIndex, last_record_start, record_ends
+from secondary_index import SecondaryIndex
+from sharded import ShardedDataset
+from snapshot import load_or_build
 
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
@@ -25,28 +42,349 @@ class Server:
 
     DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
+    _shared: Dict[Tuple[str, str, bool], Tuple[Sequence[List[str]],
+                                               List[str]]] = {}
+    _shared_loading: Dict[Tuple[str, str, bool], threading.Lock] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, storage: str = "list", snapshot: bool = False,
+                 shared: bool = False, workers: int = 1,
+                 response_cache: Optional[Any] = None,
+                 data_files: Optional[Union[str, List[str]]] = None,
+                 max_resident_shards: int = 4):
         """Initialize the Server with no dataset loaded and
-        an indexed dataset."""
+        an indexed dataset.
+
+        Args:
+            storage (str): "list" parses the whole CSV into memory,
+                "mmap" indexes row offsets and parses rows on demand,
+                "columnar" keeps dictionary-encoded typed columns.
+                A DATA_FILE ending in .gz, .bz2 or .xz is decompressed;
+                with "mmap" it is read through a checkpoint index.
+            snapshot (bool): With "columnar" storage, load from a binary
+                snapshot next to DATA_FILE when it is still current,
+                writing one after the first parse otherwise.
+            shared (bool): Reuse the read-only dataset already loaded
+                by another shared Server of the same file and storage
+                in this process. Deletions stay per instance.
+            workers (int): Processes used to parse the CSV in "list"
+                and "columnar" storage. Defaults to 1, parsing inline.
+            response_cache: A cache from 0x01-caching (any object with
+                BaseCaching's put/get/cache_data) used to memoize
+                get_hyper and get_hyper_index responses. Defaults to
+                None, no memoization.
+            data_files (str | List[str]): A glob pattern or list of CSV
+                shards, each with a header row, read in order instead of
+                DATA_FILE. Only shards a page touches are parsed.
+            max_resident_shards (int): Parsed shards kept in memory.
+                Defaults to 4.
+        """
+        assert storage in ("list", "mmap", "columnar"), \
+            "Unknown storage mode."
+        assert not snapshot or storage == "columnar", \
+            "Snapshots need columnar storage."
+        assert data_files is None or storage == "list", \
+            "Shards are read with list storage."
+        self.storage = storage
+        self.snapshot = snapshot
+        self.shared = shared
+        self.workers = workers
+        self.data_files = data_files
+        self.max_resident_shards = max_resident_shards
+        self.__lock = threading.RLock()
         self.__dataset = None
+        self.__header = []
         self.__indexed_dataset = None
+        self.__live_index = None
+        self.__secondary_index = None
+        self.__range_stats: Dict[int, RangeStats] = {}
+        self.__distinct: Dict[int, DistinctCounter] = {}
+        self.__source: Optional[Tuple[int, int, int, bytes]] = None
+        self.__response_cache = response_cache
+        self.__generation = 0
+        self.__index_spans: Dict[Tuple, Tuple[int, Optional[int], int]] = {}
+        self.__stale_responses = set()
+        self.__cache_hits = 0
+        self.__cache_misses = 0
 
-    def dataset(self) -> List[List[str]]:
+    def dataset(self) -> Sequence[List[str]]:
         """Loads and caches the dataset from the CSV file.
 
+        Concurrent first calls are single-flight: one thread parses
+        the file while the others wait for its result.
+
         Returns:
-            List[List[str]]: The cached dataset.
+            Sequence[List[str]]: The cached dataset, as a list, a
+            RowIndex or a ColumnarStore depending on the storage mode.
         """
         if self.__dataset is None:
-            try:
-                with open(self.DATA_FILE, newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    self.__dataset = [row for row in reader][1:]  # Skip header
-            except FileNotFoundError:
-                print(f"Error: {self.DATA_FILE} not found.")
-                return []
+            with self.__lock:
+                if self.__dataset is None:
+                    try:
+                        if self.shared:
+                            self.__dataset, self.__header = \
+                                self._load_shared()
+                        else:
+                            self.__dataset = self._load()
+                    except FileNotFoundError as error:
+                        print(f"Error: {error.filename} not found.")
+                        return []
         return self.__dataset
 
+    def loaded(self) -> bool:
+        """Whether dataset() would return without reading the file."""
+        return self.__dataset is not None
+
+    def _load_shared(self) -> Tuple[Sequence[List[str]], List[str]]:
+        """Loads DATA_FILE at most once per process for shared Servers."""
+        key = self._shared_key()
+        with Server._shared_lock:
+            entry = Server._shared.get(key)
+            if entry is not None:
+                return entry
+            loading = Server._shared_loading.setdefault(key,
+                                                        threading.Lock())
+        with loading:
+            with Server._shared_lock:
+                entry = Server._shared.get(key)
+            if entry is None:
+                entry = (self._load(), self.__header)
+                with Server._shared_lock:
+                    Server._shared[key] = entry
+                    Server._shared_loading.pop(key, None)
+        return entry
+
+    def _shared_key(self) -> Tuple[str, str, bool]:
+        """Identifies the datasets that shared Servers may reuse."""
+        files = self.data_files
+        if files is not None:
+            return (repr(files), "sharded", False)
+        return (os.path.abspath(self.DATA_FILE), self.storage, self.snapshot)
+
+    @classmethod
+    def clear_shared(cls) -> None:
+        """Forgets every dataset shared between Server instances."""
+        with Server._shared_lock:
+            Server._shared.clear()
+
+    def warmup(self, indexes: bool = False,
+               aggregates: bool = False) -> None:
+        """Loads the dataset ahead of the first request, e.g. at boot.
+
+        Args:
+            indexes (bool): Also build the live-row and secondary
+                indexes. Defaults to False.
+            aggregates (bool): Also build the range statistics and
+                distinct counter of aggregate()'s default columns, so
+                that no request pays for them. Defaults to False.
+        """
+        self.dataset()
+        if indexes:
+            self.live_index()
+            self.secondary_index()
+        if aggregates:
+            self.range_stats()
+            self.distinct_counter()
+
+    def reload(self, tail: bool = False) -> Optional[int]:
+        """Re-reads DATA_FILE.
+
+        A full reload drops the dataset and everything derived from it,
+        so the next request parses the file again; deleted rows come
+        back. A tail reload only parses the records appended since the
+        last parse and extends the dataset, indexes and indexed_dataset
+        in place, keeping deletions. It falls back to a full reload when
+        the file was truncated or replaced, or for shared Servers.
+
+        Args:
+            tail (bool): Try an incremental tail reload. Defaults to False.
+
+        Returns:
+            Optional[int]: The number of rows appended by a tail reload,
+            or None when a full reload was done instead.
+        """
+        with self.__lock:
+            if tail and not self.shared and self.__source is not None:
+                appended = self._reload_tail()
+                if appended is not None:
+                    return appended
+            self._forget()
+            return None
+
+    def _forget(self) -> None:
+        """Drops the dataset and everything derived from it."""
+        if self.shared:
+            with Server._shared_lock:
+                Server._shared.pop(self._shared_key(), None)
+        self.__dataset = None
+        self.__header = []
+        self.__source = None
+        self.__indexed_dataset = None
+        self.__live_index = None
+        self.__secondary_index = None
+        self.__range_stats.clear()
+        self.__distinct.clear()
+        self._invalidate_responses()
+
+    def _reload_tail(self) -> Optional[int]:
+        """Appends the records written after the parsed offset, or
+        returns None if the file is no longer the one parsed.
+
+        A last record that had no newline is parsed again and replaces
+        the row read from it. The update is all or nothing: should it
+        fail part way, everything derived from the file is dropped, as
+        by a full reload, before the error propagates.
+        """
+        dev, ino, offset, head, pending = self.__source
+        try:
+            with open(self.DATA_FILE, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                if (stat.st_dev, stat.st_ino) != (dev, ino) or \
+                        stat.st_size < offset or f.read(len(head)) != head:
+                    return None
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        dataset = self.__dataset
+        size = len(dataset)
+        rows = list(csv.reader(io.StringIO(data.decode('utf-8'),
+                                           newline='')))
+        ends = record_ends(data)
+        parsed = ends[-1] if ends else 0
+        if parsed == len(data):
+            source = (dev, ino, offset + parsed, head, False)
+        else:
+            source = (dev, ino, offset + parsed, head, bool(rows))
+        if pending:
+            last = dataset[size - 1]
+            replaced = rows[0]
+            changed = replaced + [''] * (len(last) - len(replaced)) != last
+            rows = rows[1:]
+        else:
+            changed = False
+        if not rows and not changed:
+            self.__source = source
+            return 0
+        try:
+            self._apply_tail(size, rows, replaced if changed else None)
+        except BaseException:
+            self._forget()
+            raise
+        self.__source = source
+        return len(rows)
+
+    def _apply_tail(self, size: int, rows: List[List[str]],
+                    replaced: Optional[List[str]]) -> None:
+        """Appends `rows` after the first `size` rows of the dataset,
+        after replacing the last of them with `replaced` if given."""
+        dataset = self.__dataset
+        last = size - 1
+        if self.storage == "mmap":
+            dataset.refresh()
+        elif self.storage == "columnar":
+            if replaced is not None:
+                dataset.truncate(last)
+                dataset.extend([replaced])
+            dataset.extend(rows)
+        else:
+            if replaced is not None:
+                dataset[last] = replaced
+            dataset.extend(rows)
+        indexed = self.__indexed_dataset
+        if indexed is not None:
+            if replaced is not None and last in indexed:
+                indexed[last] = dataset[last]
+            indexed.update(enumerate(rows, size))
+        if self.__live_index is not None:
+            self.__live_index.extend(len(rows))
+        if replaced is not None:
+            self.__secondary_index = None  # Rebuilt on the next query
+        elif self.__secondary_index is not None:
+            self.__secondary_index.extend(rows)
+        # Rebuild the aggregates already built here, not on a request.
+        built = list(self.__range_stats), list(self.__distinct)
+        self.__range_stats.clear()
+        self.__distinct.clear()
+        for position in built[0]:
+            self.range_stats(position)
+        for position in built[1]:
+            self.distinct_counter(position)
+        self._invalidate_responses()
+
+    def _invalidate_responses(self) -> None:
+        """Retires every cached response after the dataset changed."""
+        self.__generation += 1
+        self.__index_spans.clear()
+        self.__stale_responses.clear()
+
+    def _load(self) -> Sequence[List[str]]:
+        """Reads DATA_FILE into the configured storage, remembering how
+        many bytes of it were parsed."""
+        if self.data_files is not None:
+            store = ShardedDataset(self.data_files, self.max_resident_shards)
+            self.__header = store.header
+            return store
+        compressed = compression(self.DATA_FILE) is not None
+        if self.storage == "mmap" and compressed:
+            store = CompressedRowIndex(self.DATA_FILE)
+            size = 0
+        elif self.storage == "mmap":
+            store = RowIndex(self.DATA_FILE)
+            size = store.offsets[-1]
+        elif self.snapshot:
+            store, size = load_or_build(self.DATA_FILE)
+        elif self.workers > 1 and not compressed:
+            size = os.path.getsize(self.DATA_FILE)
+            header, rows = parse_parallel(self.DATA_FILE, self.workers,
+                                          size=size)
+            if self.storage == "columnar":
+                store = ColumnarStore.from_rows(rows, header)
+            else:
+                store = rows
+        else:
+            with open_text(self.DATA_FILE) as f:
+                store, header = self._read(csv.reader(f))
+                size = 0 if compressed else f.buffer.tell()
+        if self.storage != "list":
+            header = store.header
+        self.__header = header
+        if compressed:
+            return store  # Compressed files are not tail-reloaded
+        stat = os.stat(self.DATA_FILE)
+        with open(self.DATA_FILE, 'rb') as f:
+            f.seek(max(size - 1, 0))
+            pending = size > 0 and len(store) > 0 and f.read(1) != b'\n'
+            if pending:
+                # The last record has no newline yet: the writer may be
+                # in the middle of it, so a tail reload parses it again.
+                size = store.offsets[-2] if self.storage == "mmap" else \
+                    last_record_start(self.DATA_FILE, size,
+                                      store[len(store) - 1])
+            f.seek(0)
+            head = f.read(min(size, 4096))
+        self.__source = (stat.st_dev, stat.st_ino, size, head, pending)
+        return store
+
+    def _read(self, reader: Iterator[List[str]]
+              ) -> Tuple[Sequence[List[str]], List[str]]:
+        """Builds the configured storage from a csv reader, returning
+        it with the header."""
+        if self.storage == "columnar":
+            store = ColumnarStore.from_rows(reader, next(reader, None))
+            return store, store.header
+        rows = [row for row in reader]
+        return rows[1:], rows[0] if rows else []  # Skip header
+
+    def header(self) -> List[str]:
+        """Provides the column names from the CSV header row.
+
+        Returns:
+            List[str]: The header, empty if the file has none.
+        """
+        self.dataset()
+        return self.__header
+
     def indexed_dataset(self) -> Dict[int, List[str]]:
         """Provides an indexed dataset.
 
@@ -54,20 +392,264 @@ class Server:
             Dict[int, List[str]]: A dictionary mapping indices to dataset rows.
         """
         if self.__indexed_dataset is None:
-            dataset = self.dataset()
-            self.__indexed_dataset = {i: dataset[i] for i in range(
-                len(dataset))}
+            with self.__lock:
+                if self.__indexed_dataset is None:
+                    dataset = self.dataset()
+                    live = self.live_index()
+                    self.__indexed_dataset = {i: dataset[i] for i in range(
+                        len(dataset)) if i in live}
         return self.__indexed_dataset
 
-    def get_page(self, page: int = 1, page_size: int = 10) -> List[List[str]]:
+    def live_index(self) -> LiveIndex:
+        """Provides the order-statistic index of live rows.
+
+        Returns:
+            LiveIndex: A Fenwick tree over the rows not yet deleted.
+        """
+        if self.__live_index is None:
+            with self.__lock:
+                if self.__live_index is None:
+                    self.__live_index = LiveIndex(len(self.dataset()))
+        return self.__live_index
+
+    def secondary_index(self) -> SecondaryIndex:
+        """Provides the posting lists and sort ranks of every column.
+
+        Returns:
+            SecondaryIndex: The index, built on first use.
+        """
+        if self.__secondary_index is None:
+            with self.__lock:
+                if self.__secondary_index is None:
+                    self.__secondary_index = SecondaryIndex(
+                        self.dataset(), self.header())
+        return self.__secondary_index
+
+    def _column(self, key: Union[str, int]) -> int:
+        """Resolves a column name or position to a position."""
+        if isinstance(key, int):
+            return key
+        try:
+            return self.header().index(key)
+        except ValueError:
+            raise KeyError(key) from None
+
+    def _cells(self, column: int) -> Iterator[str]:
+        """Streams one column of the dataset in file order."""
+        dataset = self.dataset()
+        for start in range(0, len(dataset), 1 << 16):
+            for row in dataset[start:start + (1 << 16)]:
+                yield row[column]
+
+    def range_stats(self, column: Union[str, int] = "Count") -> RangeStats:
+        """Provides prefix sums and min/max block tables of an integer
+        column, built by warmup(aggregates=True) or on first use.
+
+        Args:
+            column (str | int): Column name or position. Defaults to
+                "Count".
+
+        Returns:
+            RangeStats: The precomputed tables.
+        """
+        position = self._column(column)
+        stats = self.__range_stats.get(position)
+        if stats is None:
+            with self.__lock:
+                stats = self.__range_stats.get(position)
+                if stats is None:
+                    stats = RangeStats(map(int, self._cells(position)))
+                    self.__range_stats[position] = stats
+        return stats
+
+    def distinct_counter(self, column: Union[str, int] = "Child's First Name"
+                         ) -> DistinctCounter:
+        """Provides the distinct-value counter of a column, built by
+        warmup(aggregates=True) or on first use.
+
+        Args:
+            column (str | int): Column name or position. Defaults to
+                "Child's First Name".
+
+        Returns:
+            DistinctCounter: The precomputed wavelet matrix.
+        """
+        position = self._column(column)
+        counter = self.__distinct.get(position)
+        if counter is None:
+            with self.__lock:
+                counter = self.__distinct.get(position)
+                if counter is None:
+                    counter = DistinctCounter(list(self._cells(position)))
+                    self.__distinct[position] = counter
+        return counter
+
+    def aggregate(self, start: int, end: int,
+                  column: Union[str, int] = "Count",
+                  distinct: Union[str, int] = "Child's First Name"
+                  ) -> Dict[str, Any]:
+        """Aggregates the rows in [start, end) of the dataset.
+
+        Sums and running totals take O(1), min and max O(1) plus a scan
+        of at most two 64-row blocks, and the distinct count O(log n).
+        The tables behind them are built by warmup(aggregates=True), or
+        else by the first call.
+
+        Args:
+            start (int): First row of the range.
+            end (int): Row after the last one of the range.
+            column (str | int): Integer column to sum. Defaults to "Count".
+            distinct (str | int): Column whose distinct values are
+                counted. Defaults to "Child's First Name".
+
+        Returns:
+            Dict[str, Any]: sum, min and max of `column` (min/max None
+            for an empty range), the count of distinct `distinct`
+            values, and running_total, the sum of `column` over every
+            row before `end`.
+        """
+        assert 0 <= start <= end, "Invalid range."
+        stats = self.range_stats(column)
+        end = min(end, len(stats))
+        start = min(start, end)
+        return {
+            'sum': stats.sum(start, end),
+            'min': stats.min(start, end),
+            'max': stats.max(start, end),
+            'distinct': self.distinct_counter(distinct).count(start, end),
+            'running_total': stats.running_total(end)
+        }
+
+    def _matching(self, where: Optional[Dict[Any, Any]],
+                  order_by: Optional[Any]) -> Sequence[int]:
+        """Row ids selected by a filter and sort, in page order."""
+        if where is None and order_by is None:
+            return range(len(self.dataset()))
+        return self.secondary_index().query(where, order_by)
+
+    def response_cache_stats(self) -> Dict[str, int]:
+        """Provides the response cache counters.
+
+        Returns:
+            Dict[str, int]: hits, misses and the number of cached
+            responses.
+        """
+        cache = self.__response_cache
+        return {
+            'hits': self.__cache_hits,
+            'misses': self.__cache_misses,
+            'size': 0 if cache is None else len(cache.cache_data)
+        }
+
+    def _cached_response(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Looks a response up in the response cache."""
+        response = None
+        if key not in self.__stale_responses:
+            response = self.__response_cache.get(key)
+        if response is None:
+            self.__cache_misses += 1
+            return None
+        self.__cache_hits += 1
+        return dict(response)
+
+    def _cache_response(self, key: Tuple, response: Dict[str, Any]) -> None:
+        """Stores a freshly built response in the response cache."""
+        self.__stale_responses.discard(key)
+        self.__response_cache.put(key, dict(response))
+
+    def _invalidate_rows(self, index: int, count_before: int) -> None:
+        """Marks stale the cached get_hyper_index responses that a
+        deletion or restoration of row `index` changes.
+
+        A response changes when the row falls inside the span it
+        covered (open-ended for a short last page) or when its
+        total_pages no longer matches the live row count.
+        """
+        if not self.__index_spans:
+            return
+        cached = self.__response_cache.cache_data
+        count = self.live_index().count
+        for key, (start, end, page_size) in list(
+                self.__index_spans.items()):
+            if key not in cached:
+                del self.__index_spans[key]
+            elif (start <= index and (end is None or index < end)) or \
+                    -(-count // page_size) != -(-count_before // page_size):
+                self.__stale_responses.add(key)
+                del self.__index_spans[key]
+
+    def _sync_indexed(self) -> None:
+        """Carry rows removed from, or put back into, indexed_dataset()
+        directly over to the live index, dropping cached responses.
+
+        delete() and restore() keep one key in indexed_dataset() per
+        live row, so the rows are only compared when the sizes differ.
+        """
+        indexed, live = self.__indexed_dataset, self.__live_index
+        if indexed is None or live is None or len(indexed) == live.count:
+            return
+        with self.__lock:
+            for row in range(len(live)):
+                if row in live and row not in indexed:
+                    live.delete(row)
+                elif row in indexed and row not in live:
+                    live.restore(row)
+            self._invalidate_responses()
+
+    def delete(self, index: int) -> bool:
+        """Deletes a row so that get_hyper_index skips it.
+
+        Args:
+            index (int): The position of the row in the dataset.
+
+        Returns:
+            bool: True if the row was live before the call.
+        """
+        assert 0 <= index < len(self.dataset()), "Index is out of bounds."
+        if self.__indexed_dataset is not None:
+            self.__indexed_dataset.pop(index, None)
+        live = self.live_index()
+        if not live.delete(index):
+            return False
+        self._invalidate_rows(index, live.count + 1)
+        return True
+
+    def restore(self, index: int) -> bool:
+        """Restores a previously deleted row.
+
+        Args:
+            index (int): The position of the row in the dataset.
+
+        Returns:
+            bool: True if the row was deleted before the call.
+        """
+        assert 0 <= index < len(self.dataset()), "Index is out of bounds."
+        live = self.live_index()
+        if not live.restore(index):
+            return False
+        if self.__indexed_dataset is not None:
+            self.__indexed_dataset[index] = self.dataset()[index]
+        self._invalidate_rows(index, live.count - 1)
+        return True
+
+    def get_page(self, page: int = 1, page_size: int = 10,
+                 where: Optional[Dict[Any, Any]] = None,
+                 order_by: Optional[Any] = None) -> PageView:
         """Returns the specified page of data.
 
+        The page is a read-only view over the dataset: rows are not
+        copied until they are read.
+
         Args:
             page (int): The page number to retrieve. Defaults to 1.
             page_size (int): The number of records per page. Defaults to 10.
+            where (Dict): Column name (or position) to the value rows
+                must hold, e.g. {"Gender": "FEMALE"}. Defaults to None.
+            order_by (str): Column to sort by, "-" prefixed for
+                descending order, e.g. "-Count". Defaults to file order.
 
         Returns:
-            List[List[str]]: The data for the specified page.
+            PageView: The data for the specified page.
         """
         assert isinstance(page, int) and page > 0, \
             "Page must be a positive integer."
@@ -75,22 +657,46 @@ class Server:
             "Page size must be a positive integer."
 
         start, end = index_range(page, page_size)
-        return self.dataset()[start:end]
+        if where is None and order_by is None:
+            return PageView(self.dataset(), start, end)
+        dataset = self.dataset()
+        return PageView(dataset,
+                        ids=self._matching(where, order_by)[start:end])
 
-    def get_hyper(self, page: int = 1, page_size: int = 10) -> Dict[str, Any]:
+    def get_hyper(self, page: int = 1, page_size: int = 10,
+                  where: Optional[Dict[Any, Any]] = None,
+                  order_by: Optional[Any] = None,
+                  stats: bool = False) -> Dict[str, Any]:
         """Provides pagination metadata.
 
         Args:
             page (int): The current page number. Defaults to 1.
             page_size (int): The number of records per page. Defaults to 10.
+            where (Dict): Equality filters, as for get_page.
+            order_by (str): Sort column, as for get_page.
+            stats (bool): Add a 'stats' key with aggregate() over the
+                page's rows. Only for unfiltered, file-order pages.
 
         Returns:
             Dict[str, Any]: A dictionary containing pagination
-            metadata and data.
+            metadata and data, counted over the filtered rows. The
+            data is a list of rows, so the response is JSON
+            serializable.
         """
-        data = self.get_page(page, page_size)
-        total_pages = math.ceil(len(self.dataset()) / page_size)
-        return {
+        assert not stats or (where is None and order_by is None), \
+            "Stats need unfiltered, file-order pages."
+        key = None
+        if self.__response_cache is not None:
+            key = ('page', self.__generation, page, page_size,
+                   tuple(sorted((str(c), str(v)) for c, v in (
+                       where or {}).items())), order_by, stats)
+            response = self._cached_response(key)
+            if response is not None:
+                return response
+        data = self.get_page(page, page_size, where, order_by).tolist()
+        total_pages = math.ceil(len(self._matching(where, order_by)) /
+                                page_size)
+        response = {
             'page_size': len(data),
             'page': page,
             'data': data,
@@ -98,6 +704,11 @@ class Server:
             'prev_page': page - 1 if page > 1 else None,
             'total_pages': total_pages
         }
+        if stats:
+            response['stats'] = self.aggregate(*index_range(page, page_size))
+        if key is not None:
+            self._cache_response(key, response)
+        return response
 
     def get_hyper_index(self, index: int = 0, page_size: int = 10
                         ) -> Dict[str, Any]:
@@ -109,22 +720,113 @@ class Server:
 
         Returns:
             Dict[str, Any]: A dictionary containing pagination
-            metadata and data.
+            metadata and data (a list of rows), where total_pages
+            counts live rows only.
         """
-        assert 0 <= index < len(self.indexed_dataset()), \
-            "Index is out of bounds."
+        self._sync_indexed()
+        key = None
+        if self.__response_cache is not None:
+            key = ('index', self.__generation, index, page_size)
+            response = self._cached_response(key)
+            if response is not None:
+                return response
+        dataset = self.dataset()
+        assert 0 <= index < len(dataset), "Index is out of bounds."
 
+        live = self.live_index()
         data = []
         next_index = index
-        for _ in range(page_size):
-            while next_index not in self.indexed_dataset():
-                next_index += 1
-            data.append(self.indexed_dataset()[next_index])
-            next_index += 1
+        row = live.select(live.rank(index))
+        while len(data) < page_size and row is not None:
+            data.append(dataset[row])
+            next_index = row + 1
+            row = live.following(row + 1)
 
-        return {
+        response = {
             'index': index,
             'next_index': next_index,
             'page_size': len(data),
-            'data': data
+            'data': data,
+            'total_pages': math.ceil(live.count / page_size)
         }
+        if key is not None:
+            self._cache_response(key, response)
+            self.__index_spans[key] = (
+                index, next_index if len(data) == page_size else None,
+                page_size)
+        return response
+
+    def iter_pages(self, page_size: int = 10, start_page: int = 1,
+                   prefetch_pages: int = 0) -> Iterator[Dict[str, Any]]:
+        """Lazily yields every page from start_page on, shaped like
+        get_hyper.
+
+        When the dataset is not loaded yet the CSV is streamed instead
+        of loaded; total_pages is then None and next_page comes from
+        reading one page ahead.
+
+        Args:
+            page_size (int): The number of records per page. Defaults to 10.
+            start_page (int): The first page to yield. Defaults to 1.
+            prefetch_pages (int): Pages to prepare ahead on a worker
+                thread. Defaults to 0, no worker.
+
+        Returns:
+            Iterator[Dict[str, Any]]: The pages, in order.
+        """
+        assert isinstance(start_page, int) and start_page > 0, \
+            "Page must be a positive integer."
+        assert isinstance(page_size, int) and page_size > 0, \
+            "Page size must be a positive integer."
+        if self.__dataset is None and self.data_files is None:
+            pages = self._stream_pages(page_size, start_page)
+        else:
+            pages = self._loaded_pages(page_size, start_page)
+        if prefetch_pages:
+            return prefetch(pages, prefetch_pages)
+        return pages
+
+    def _loaded_pages(self, page_size: int, start_page: int
+                      ) -> Iterator[Dict[str, Any]]:
+        """Pages sliced from the loaded dataset."""
+        dataset = self.dataset()
+        total_pages = math.ceil(len(dataset) / page_size)
+        for page in range(start_page, total_pages + 1):
+            start, end = index_range(page, page_size)
+            data = dataset[start:end]
+            yield {
+                'page_size': len(data),
+                'page': page,
+                'data': data,
+                'next_page': page + 1 if page < total_pages else None,
+                'prev_page': page - 1 if page > 1 else None,
+                'total_pages': total_pages
+            }
+
+    def _stream_pages(self, page_size: int, start_page: int
+                      ) -> Iterator[Dict[str, Any]]:
+        """Pages parsed straight from DATA_FILE, one page ahead."""
+        try:
+            f = open_text(self.DATA_FILE)
+        except FileNotFoundError:
+            print(f"Error: {self.DATA_FILE} not found.")
+            return
+        with f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header
+            start, _ = index_range(start_page, page_size)
+            rows = itertools.islice(reader, start, None)
+            page = start_page
+            data = list(itertools.islice(rows, page_size))
+            while data:
+                ahead = list(itertools.islice(rows, page_size))
+                yield {
+                    'page_size': len(data),
+                    'page': page,
+                    'data': data,
+                    'next_page': page + 1 if ahead else None,
+                    'prev_page': page - 1 if page > 1 else None,
+                    'total_pages': None
+                }
+                page += 1
+                data = ahead
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Range aggregates over dataset columns"""
+import itertools
+from array import array
+from typing import Hashable, Iterable, List, Optional, Sequence
+
+
+BLOCK = 64
+BITS = bytes.maketrans(b'\x00\x01', b'01')
+
+
+def _sparse(values: Sequence[int], pick) -> List[array]:
+    """Sparse table: `pick` (min or max) of every power-of-two long
+    window of `values`, one array per window length."""
+    tables = [array('q', values)]
+    width = 1
+    while width * 2 <= len(values):
+        table = tables[-1]
+        count = len(values) - width * 2 + 1
+        tables.append(array('q', map(pick, table[:count],
+                                     table[width:width + count])))
+        width *= 2
+    return tables
+
+
+class RangeStats:
+    """Sum, min and max of any [start, end) range of an integer column.
+
+    Prefix sums answer sums and running totals in O(1). Min and max are
+    block-decomposed: the values are cut into blocks of BLOCK, and
+    sparse tables over the block minima and maxima answer the whole
+    blocks of a range in O(1), leaving at most two partial blocks to
+    scan. The tables hold O(n log n / BLOCK) entries, so the whole
+    structure takes about 16 bytes per row.
+    """
+
+    def __init__(self, values: Iterable[int]) -> None:
+        """Precompute the prefix sums and block tables of `values`."""
+        self.values = array('q', values)
+        self.prefix = array('q', [0])
+        self.prefix.extend(itertools.accumulate(self.values))
+        values = self.values
+        blocks = range(0, len(values), BLOCK)
+        self.mins = _sparse([min(values[i:i + BLOCK]) for i in blocks], min)
+        self.maxs = _sparse([max(values[i:i + BLOCK]) for i in blocks], max)
+
+    def __len__(self) -> int:
+        """Number of values covered."""
+        return len(self.values)
+
+    def running_total(self, end: int) -> int:
+        """Sum of the first `end` values."""
+        return self.prefix[min(max(end, 0), len(self))]
+
+    def sum(self, start: int, end: int) -> int:
+        """Sum of the values in [start, end)."""
+        return self.running_total(end) - self.running_total(start)
+
+    def _pick(self, start: int, end: int, pick,
+              tables: List[array]) -> Optional[int]:
+        """`pick` (min or max) of the values in [start, end)."""
+        end = min(end, len(self))
+        if start >= end:
+            return None
+        first, last = start // BLOCK + 1, (end - 1) // BLOCK
+        if first > last:
+            return pick(self.values[start:end])
+        found = pick(pick(self.values[start:first * BLOCK]),
+                     pick(self.values[last * BLOCK:end]))
+        if first < last:
+            level = (last - first).bit_length() - 1
+            table = tables[level]
+            found = pick(found, table[first], table[last - (1 << level)])
+        return found
+
+    def min(self, start: int, end: int) -> Optional[int]:
+        """Smallest value in [start, end), None for an empty range."""
+        return self._pick(start, end, min, self.mins)
+
+    def max(self, start: int, end: int) -> Optional[int]:
+        """Largest value in [start, end), None for an empty range."""
+        return self._pick(start, end, max, self.maxs)
+
+
+class BitLevel:
+    """One wavelet matrix level: a bit vector with rank of zeros.
+
+    The bits are packed 64 to a word, with the number of zeros before
+    each word, so rank costs one lookup and one popcount and the level
+    takes 12 bytes per 64 values.
+    """
+
+    def __init__(self, bits: bytes) -> None:
+        """Pack a bytes object of 0 and 1 values."""
+        digits = bits.translate(BITS)
+        self.words = array('Q')
+        self.before = array('I', [0])
+        zeros = 0
+        for i in range(0, len(digits), 64):
+            chunk = digits[i:i + 64]
+            self.words.append(int(chunk[::-1], 2))
+            zeros += chunk.count(b'0')
+            self.before.append(zeros)
+        self.words.append(0)  # rank(len) reads one word past the end
+        self.zeros = zeros
+
+    def rank0(self, position: int) -> int:
+        """Number of zero bits before `position`."""
+        word, offset = position >> 6, position & 63
+        ones = bin(self.words[word] & ((1 << offset) - 1)).count('1')
+        return self.before[word] + offset - ones
+
+
+class DistinctCounter:
+    """Number of distinct keys in any [start, end) range in O(log n).
+
+    A key at position i is the first of its kind inside [start, end)
+    exactly when its previous occurrence is before `start`. A wavelet
+    matrix over those previous-occurrence positions counts them with
+    one rank lookup per bit level. Each level is a packed bit vector,
+    so the matrix takes under 2 bits per row and level.
+    """
+
+    def __init__(self, keys: Sequence[Hashable]) -> None:
+        """Precompute previous occurrences and the wavelet matrix."""
+        last = {}
+        previous = []
+        for position, key in enumerate(keys):
+            previous.append(last.get(key, -1) + 1)
+            last[key] = position
+        self.size = len(previous)
+        self.bits = max(self.size, 1).bit_length()
+        self.levels: List[BitLevel] = []
+        current = previous
+        for bit in reversed(range(self.bits)):
+            self.levels.append(BitLevel(bytes(
+                [value >> bit & 1 for value in current])))
+            current = [v for v in current if not v >> bit & 1] + \
+                [v for v in current if v >> bit & 1]
+
+    def _count_less(self, start: int, end: int, bound: int) -> int:
+        """How many stored values in [start, end) are below `bound`."""
+        found = 0
+        for level, bit in zip(self.levels, reversed(range(self.bits))):
+            low, high = level.rank0(start), level.rank0(end)
+            if bound >> bit & 1:
+                found += high - low
+                start = level.zeros + start - low
+                end = level.zeros + end - high
+            else:
+                start, end = low, high
+        return found
+
+    def count(self, start: int, end: int) -> int:
+        """Distinct keys in [start, end)."""
+        end = min(end, self.size)
+        if start >= end:
+            return 0
+        return self._count_less(start, end, start + 1)
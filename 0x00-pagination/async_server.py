@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""asyncio pagination"""
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import (Any, AsyncIterator, Callable, Dict, List, Optional,
+                    Sequence, TypeVar)
+
+from page_view import PageView
+
+Server = __import__('3-hypermedia_del_pagination').Server
+T = TypeVar('T')
+
+
+class AsyncServer:
+    """Awaitable counterpart of Server for asyncio applications.
+
+    Work that can take long (parsing the CSV, building indexes, parsing
+    a shard) runs in an executor so the event loop keeps serving other
+    requests; only unfiltered pages of a loaded list dataset are sliced
+    inline. Paging itself is delegated to a wrapped Server, so both
+    classes return the same pages.
+    """
+
+    def __init__(self, *args: Any, executor: Optional[Executor] = None,
+                 **kwargs: Any) -> None:
+        """Wrap a new Server.
+
+        Args:
+            *args, **kwargs: Passed to Server, e.g. storage="mmap".
+            executor (Executor): Where blocking work runs. Defaults to
+                None, the event loop's default thread pool.
+        """
+        self.server = Server(*args, **kwargs)
+        self.executor = executor
+        self.__pending: Dict[str, asyncio.Future] = {}
+
+    async def _run(self, func: Callable[..., T], *args: Any,
+                   **kwargs: Any) -> T:
+        """Runs func(*args, **kwargs) in the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs))
+
+    async def _once(self, name: str, func: Callable[[], T]) -> T:
+        """Runs func in the executor, sharing one run between the
+        coroutines that ask for `name` while it is in flight."""
+        future = self.__pending.get(name)
+        if future is None:
+            future = asyncio.ensure_future(self._run(func))
+            self.__pending[name] = future
+            future.add_done_callback(
+                lambda _: self.__pending.pop(name, None))
+        # A cancelled caller must not cancel the run the others await.
+        return await asyncio.shield(future)
+
+    async def dataset(self) -> Sequence[List[str]]:
+        """Loads the dataset without blocking the event loop.
+
+        Concurrent first calls wait for a single load.
+
+        Returns:
+            Sequence[List[str]]: The dataset, as Server.dataset().
+        """
+        if self.server.loaded():
+            return self.server.dataset()
+        return await self._once('dataset', self.server.dataset)
+
+    async def warmup(self, indexes: bool = False,
+                     aggregates: bool = False) -> None:
+        """Loads the dataset, and optionally the indexes and aggregate
+        tables, ahead of the first request.
+
+        Args:
+            indexes (bool): Also build the live-row and secondary
+                indexes. Defaults to False.
+            aggregates (bool): Also build the tables behind aggregate().
+                Defaults to False.
+        """
+        await self.dataset()
+        if indexes or aggregates:
+            await self._once(f'warmup-{indexes}-{aggregates}',
+                             functools.partial(self.server.warmup, indexes,
+                                               aggregates))
+
+    async def reload(self, tail: bool = False) -> Optional[int]:
+        """Re-reads the data file, as Server.reload()."""
+        return await self._run(self.server.reload, tail)
+
+    async def delete(self, index: int) -> bool:
+        """Hides a row from get_hyper_index, as Server.delete()."""
+        await self.dataset()
+        return await self._run(self.server.delete, index)
+
+    async def restore(self, index: int) -> bool:
+        """Brings a deleted row back, as Server.restore()."""
+        await self.dataset()
+        return await self._run(self.server.restore, index)
+
+    @staticmethod
+    def _inline(dataset: Sequence[List[str]],
+                where: Optional[Dict[Any, Any]], order_by: Optional[Any],
+                stats: bool = False) -> bool:
+        """Whether a page of the loaded dataset is cheap enough to be
+        cut on the event loop: only an unfiltered page of rows already
+        parsed into a list. mmap, columnar, compressed and sharded rows
+        are parsed or decoded on the worker thread."""
+        return where is None and order_by is None and not stats and \
+            isinstance(dataset, list)
+
+    async def get_page(self, page: int = 1, page_size: int = 10,
+                       where: Optional[Dict[Any, Any]] = None,
+                       order_by: Optional[Any] = None) -> PageView:
+        """Returns the specified page of data, as Server.get_page().
+
+        Returns:
+            PageView: The data for the specified page.
+        """
+        dataset = await self.dataset()
+        if self._inline(dataset, where, order_by):
+            return self.server.get_page(page, page_size)
+        return await self._run(lambda: self.server.get_page(
+            page, page_size, where, order_by).load())
+
+    async def get_hyper(self, page: int = 1, page_size: int = 10,
+                        where: Optional[Dict[Any, Any]] = None,
+                        order_by: Optional[Any] = None,
+                        stats: bool = False) -> Dict[str, Any]:
+        """Provides pagination metadata, as Server.get_hyper().
+
+        Returns:
+            Dict[str, Any]: A dictionary containing pagination
+            metadata and data.
+        """
+        dataset = await self.dataset()
+        if self._inline(dataset, where, order_by, stats):
+            return self.server.get_hyper(page, page_size)
+        return await self._run(self.server.get_hyper, page, page_size,
+                               where, order_by, stats)
+
+    async def get_hyper_index(self, index: int = 0, page_size: int = 10
+                              ) -> Dict[str, Any]:
+        """Pagination with dynamic indexing after deletions, as
+        Server.get_hyper_index().
+
+        Returns:
+            Dict[str, Any]: A dictionary containing pagination
+            metadata and data.
+        """
+        await self.dataset()
+        return await self._run(self.server.get_hyper_index, index,
+                               page_size)
+
+    async def iter_pages(self, page_size: int = 10, start_page: int = 1
+                         ) -> AsyncIterator[Dict[str, Any]]:
+        """Yields every page from start_page on, shaped like get_hyper.
+
+        Args:
+            page_size (int): The number of records per page. Defaults to 10.
+            start_page (int): The first page to yield. Defaults to 1.
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: The pages, in order.
+        """
+        assert isinstance(start_page, int) and start_page > 0, \
+            "Page must be a positive integer."
+        page = start_page
+        while True:
+            response = await self.get_hyper(page, page_size)
+            if page > response['total_pages']:
+                return
+            yield response
+            if response['next_page'] is None:
+                return
+            page = response['next_page']
+            await asyncio.sleep(0)  # Let other tasks run between pages
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Pagination benchmark suite
+
+Synthesizes baby-names-shaped CSV files and measures, for each size and
+storage mode, the cold load time, peak RSS and per-call latency of
+index_range, get_page, get_hyper and get_hyper_index. Each measurement
+runs in a fresh interpreter so load time and RSS are not polluted by
+earlier runs. Results are printed (or written) as JSON for diffing.
+
+Usage:
+    ./benchmark.py [--sizes 10000,100000] [--storage list,columnar]
+                   [--repeat 200] [--data-dir DIR] [--output FILE]
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+index_range = __import__('0-simple_helper_function').index_range
+Server = __import__('3-hypermedia_del_pagination').Server
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+DELETION_RATIOS = (0.0, 0.1, 0.5)
+HEADER = ["Year of Birth", "Gender", "Ethnicity", "Child's First Name",
+          "Count", "Rank"]
+ETHNICITIES = ["ASIAN AND PACIFIC ISLANDER", "BLACK NON HISPANIC",
+               "HISPANIC", "WHITE NON HISPANIC"]
+
+
+def synthesize(path: str, rows: int, seed: int = 0) -> None:
+    """Write a CSV shaped like Popular_Baby_Names.csv.
+
+    Args:
+        path (str): Where to write the file.
+        rows (int): Number of data rows.
+        seed (int): Random seed, so every run sees the same file.
+    """
+    rng = random.Random(seed)
+    names = [f"Name{i}" for i in range(2000)]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for i in range(rows):
+            writer.writerow([2011 + i % 9, rng.choice(("FEMALE", "MALE")),
+                             rng.choice(ETHNICITIES), rng.choice(names),
+                             rng.randint(10, 300), rng.randint(1, 100)])
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50 and p99 of latency samples, in microseconds."""
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {'p50_us': round(ordered[last // 2] * 1e6, 2),
+            'p99_us': round(ordered[last * 99 // 100] * 1e6, 2)}
+
+
+def timed(call: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Latency percentiles of `repeat` calls."""
+    samples = []
+    clock = time.perf_counter
+    for _ in range(repeat):
+        began = clock()
+        call()
+        samples.append(clock() - began)
+    return percentiles(samples)
+
+
+def measure(path: str, storage: str, repeat: int) -> Dict[str, Any]:
+    """Benchmark one file in one storage mode, in this process."""
+    server = Server(storage)
+    server.DATA_FILE = path
+    began = time.perf_counter()
+    size = len(server.dataset())
+    load_time = time.perf_counter() - began
+    page_size = 10
+    last = max(1, -(-size // page_size))
+    pages = {'early': 1, 'middle': max(1, last // 2), 'last': last}
+    result: Dict[str, Any] = {
+        'rows': size,
+        'storage': storage,
+        'cold_load_s': round(load_time, 4),
+        'index_range': timed(lambda: index_range(last, page_size), repeat),
+    }
+    for label, page in pages.items():
+        # get_page returns a lazy view: time reading its rows as well.
+        result[f'get_page_{label}'] = timed(
+            lambda: server.get_page(page, page_size).tolist(), repeat)
+        result[f'get_hyper_{label}'] = timed(
+            lambda: server.get_hyper(page, page_size), repeat)
+    rng = random.Random(1)
+    deleted = 0
+    for ratio in DELETION_RATIOS:
+        target = int(size * ratio)
+        while deleted < target:
+            if server.delete(rng.randrange(size)):
+                deleted += 1
+        starts = [rng.randrange(size) for _ in range(repeat)]
+        result[f'get_hyper_index_deleted_{int(ratio * 100)}pct'] = timed(
+            lambda: server.get_hyper_index(starts.pop(), page_size), repeat)
+    result['peak_rss_kb'] = resource.getrusage(
+        resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+def run(sizes: List[int], storages: List[str], repeat: int,
+        data_dir: str) -> Dict[str, Any]:
+    """Benchmark every size and storage mode in child interpreters."""
+    results = []
+    for rows in sizes:
+        path = os.path.join(data_dir, f"baby_names_{rows}.csv")
+        if not os.path.exists(path):
+            synthesize(path, rows)
+        for storage in storages:
+            child = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--measure',
+                 path, '--storage', storage, '--repeat', str(repeat)],
+                check=True, capture_output=True, text=True,
+                cwd=os.path.dirname(os.path.abspath(__file__)))
+            results.append(json.loads(child.stdout))
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': results
+    }
+
+
+def main() -> None:
+    """Parse the command line and run the suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated row counts")
+    parser.add_argument('--storage', default='list',
+                        help="comma-separated Server storage modes")
+    parser.add_argument('--repeat', type=int, default=200,
+                        help="calls timed per measurement")
+    parser.add_argument('--data-dir', default=None,
+                        help="where synthesized CSVs are kept")
+    parser.add_argument('--output', default=None,
+                        help="write JSON here instead of stdout")
+    parser.add_argument('--measure', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.storage, args.repeat)))
+        return
+    data_dir = args.data_dir or tempfile.gettempdir()
+    report = run([int(n) for n in args.sizes.split(',')],
+                 args.storage.split(','), args.repeat, data_dir)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
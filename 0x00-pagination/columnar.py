@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Columnar, dictionary-encoded storage for CSV datasets"""
+import csv
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+INT_TYPECODES = ('b', 'h', 'i', 'q')
+
+
+def smallest_typecode(low: int, high: int,
+                      typecodes: Sequence[str] = INT_TYPECODES) -> str:
+    """Return the narrowest array typecode able to hold [low, high]."""
+    for code in typecodes:
+        bits = array(code).itemsize * 8
+        if code.isupper():
+            limits = (0, (1 << bits) - 1)
+        else:
+            limits = (-(1 << (bits - 1)), (1 << (bits - 1)) - 1)
+        if limits[0] <= low and high <= limits[1]:
+            return code
+    raise OverflowError("value does not fit in a 64-bit array")
+
+
+def _strings_nbytes(strings: Iterable[str]) -> int:
+    """Size of the distinct string objects in `strings`."""
+    seen = {}
+    for value in strings:
+        seen[id(value)] = sys.getsizeof(value)
+    return sum(seen.values())
+
+
+class CodeColumn:
+    """Low-cardinality column stored as integer codes into a value table."""
+
+    def __init__(self, codes: Sequence[int], values: List[str]) -> None:
+        """Wrap an array of codes and the strings they stand for."""
+        self.codes = codes
+        self.values = values
+
+    def __len__(self) -> int:
+        """Number of cells in the column."""
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> str:
+        """Decode one cell."""
+        return self.values[self.codes[index]]
+
+    def slice(self, start: int, stop: int) -> List[str]:
+        """Decode the cells in [start, stop)."""
+        values = self.values
+        return [values[code] for code in self.codes[start:stop]]
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the column."""
+        return (len(self.codes) * self.codes.itemsize +
+                sys.getsizeof(self.values) + _strings_nbytes(self.values))
+
+    def extend(self, cells: List[str]) -> 'Column':
+        """Append cells, returning the column that now holds them."""
+        values = self.values
+        lookup = {value: code for code, value in enumerate(values)}
+        added = []
+        for cell in cells:
+            code = lookup.get(cell)
+            if code is None:
+                code = lookup[cell] = len(values)
+                values.append(sys.intern(cell))
+            added.append(code)
+        if len(values) > 1 << 16:
+            return _reencode(self, cells)
+        typecode = smallest_typecode(0, len(values) - 1, 'BH')
+        codes = self.codes
+        if not isinstance(codes, array) or codes.typecode != typecode:
+            codes = array(typecode, codes)
+        codes.extend(added)
+        return CodeColumn(codes, values)
+
+    def truncate(self, length: int) -> 'Column':
+        """Keep the first `length` cells, returning the column."""
+        self.codes = _cut(self.codes, length)
+        return self
+
+
+class IntColumn:
+    """Column of canonical integers stored in a typed array."""
+
+    def __init__(self, numbers: Sequence[int]) -> None:
+        """Wrap an array of integers."""
+        self.numbers = numbers
+
+    def __len__(self) -> int:
+        """Number of cells in the column."""
+        return len(self.numbers)
+
+    def __getitem__(self, index: int) -> str:
+        """Format one cell back to its CSV text."""
+        return str(self.numbers[index])
+
+    def slice(self, start: int, stop: int) -> List[str]:
+        """Format the cells in [start, stop)."""
+        return list(map(str, self.numbers[start:stop]))
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the column."""
+        return len(self.numbers) * self.numbers.itemsize
+
+    def extend(self, cells: List[str]) -> 'Column':
+        """Append cells, returning the column that now holds them."""
+        added = []
+        for cell in cells:
+            try:
+                number = int(cell)
+            except ValueError:
+                return _reencode(self, cells)
+            if str(number) != cell:
+                return _reencode(self, cells)
+            added.append(number)
+        numbers = self.numbers
+        typecode = getattr(numbers, 'typecode', None) or numbers.format
+        if added:
+            needed = smallest_typecode(min(added), max(added))
+            if INT_TYPECODES.index(needed) > INT_TYPECODES.index(typecode):
+                typecode = needed
+        if not isinstance(numbers, array) or numbers.typecode != typecode:
+            numbers = array(typecode, numbers)
+        numbers.extend(added)
+        return IntColumn(numbers)
+
+    def truncate(self, length: int) -> 'Column':
+        """Keep the first `length` cells, returning the column."""
+        self.numbers = _cut(self.numbers, length)
+        return self
+
+
+class StrColumn:
+    """High-cardinality column of interned strings."""
+
+    def __init__(self, strings: List[str]) -> None:
+        """Wrap a list of (shared) string objects."""
+        self.strings = strings
+
+    def __len__(self) -> int:
+        """Number of cells in the column."""
+        return len(self.strings)
+
+    def __getitem__(self, index: int) -> str:
+        """Return one cell."""
+        return self.strings[index]
+
+    def slice(self, start: int, stop: int) -> List[str]:
+        """Return the cells in [start, stop)."""
+        return self.strings[start:stop]
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the column."""
+        return sys.getsizeof(self.strings) + _strings_nbytes(self.strings)
+
+    def extend(self, cells: List[str]) -> 'Column':
+        """Append cells, returning the column that now holds them."""
+        self.strings.extend(sys.intern(cell) for cell in cells)
+        return self
+
+    def truncate(self, length: int) -> 'Column':
+        """Keep the first `length` cells, returning the column."""
+        self.strings = _cut(self.strings, length)
+        return self
+
+
+Column = Union[CodeColumn, IntColumn, StrColumn]
+
+
+def _cut(cells: Sequence[Any], length: int) -> Sequence[Any]:
+    """The first `length` cells: cut in place for arrays and lists, as
+    a narrower view for the memoryviews of a snapshot."""
+    if isinstance(cells, (array, list)):
+        del cells[length:]
+        return cells
+    return cells[:length]
+
+
+def _reencode(column: Column, cells: List[str]) -> Column:
+    """Encode a column afresh with extra cells appended, for when its
+    current encoding cannot hold them."""
+    builder = _ColumnBuilder()
+    for value in column.slice(0, len(column)):
+        builder.add(value)
+    for value in cells:
+        builder.add(value)
+    return builder.build(256)
+
+
+class _ColumnBuilder:
+    """Dictionary-encodes one column while rows stream in."""
+
+    def __init__(self) -> None:
+        """Start with an empty value table."""
+        self.lookup: Dict[str, int] = {}
+        self.values: List[str] = []
+        self.codes = array('I')
+
+    def add(self, value: str) -> None:
+        """Append one cell."""
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.values)
+            self.values.append(sys.intern(value))
+        self.codes.append(code)
+
+    def _as_ints(self) -> Optional[List[int]]:
+        """Integer value table, or None if any value is not canonical."""
+        numbers = []
+        for value in self.values:
+            try:
+                number = int(value)
+            except ValueError:
+                return None
+            if str(number) != value:
+                return None
+            numbers.append(number)
+        return numbers
+
+    def build(self, max_codes: int) -> Column:
+        """Pick the most compact encoding for the collected cells."""
+        values, codes = self.values, self.codes
+        if len(values) <= max_codes:
+            typecode = smallest_typecode(0, max(len(values) - 1, 0), 'BH')
+            return CodeColumn(array(typecode, codes), values)
+        numbers = self._as_ints()
+        if numbers is not None:
+            typecode = smallest_typecode(min(numbers), max(numbers))
+            return IntColumn(array(typecode, [numbers[c] for c in codes]))
+        if len(values) <= 1 << 16:
+            return CodeColumn(array('H', codes), values)
+        return StrColumn([values[c] for c in codes])
+
+
+class ColumnarStore:
+    """Read-only sequence of rows kept column by column.
+
+    Rows are rebuilt as lists of strings only when they are indexed,
+    so a page costs O(page_size) however large the dataset is.
+    """
+
+    def __init__(self, columns: List[Column],
+                 header: Optional[List[str]] = None) -> None:
+        """Wrap already encoded columns of equal length."""
+        self.columns = columns
+        self.header = header or []
+        self._length = len(columns[0]) if columns else 0
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[List[str]],
+                  header: Optional[List[str]] = None,
+                  max_codes: int = 256) -> 'ColumnarStore':
+        """Encode an iterable of CSV rows.
+
+        Short rows, blank lines included, are padded with empty cells so
+        row numbers match the CSV, and a longer row adds columns that are
+        empty in the rows before it.
+
+        Args:
+            rows (Iterable[List[str]]): The data rows.
+            header (List[str]): Optional column names.
+            max_codes (int): Largest value table stored as 1-byte codes.
+
+        Returns:
+            ColumnarStore: The encoded dataset.
+        """
+        builders: List[_ColumnBuilder] = []
+        count = 0
+        for row in rows:
+            while len(builders) < max(len(row), 1):
+                builder = _ColumnBuilder()
+                for _ in range(count):
+                    builder.add('')
+                builders.append(builder)
+            for builder, value in zip(builders, row):
+                builder.add(value)
+            for builder in builders[len(row):]:
+                builder.add('')
+            count += 1
+        return cls([b.build(max_codes) for b in builders], header)
+
+    def __len__(self) -> int:
+        """Number of rows."""
+        return self._length
+
+    def __getitem__(self, key: Union[int, slice]):
+        """Rebuild one row, or the list of rows in a slice."""
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            cells = [column.slice(start, stop) for column in self.columns]
+            return [list(row) for row in zip(*cells)]
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("row index out of range")
+        return [column[key] for column in self.columns]
+
+    def extend(self, rows: List[List[str]]) -> None:
+        """Append rows, fitted to the width of the store as from_rows()
+        does: short and blank rows are padded and long rows add
+        columns."""
+        if not rows:
+            return
+        width = max(len(self.columns), max(map(len, rows)), 1)
+        while len(self.columns) < width:
+            self.columns.append(CodeColumn(array('B', bytes(self._length)),
+                                           ['']))
+        padded = [row + [''] * (width - len(row)) for row in rows]
+        self.columns = [column.extend(list(cells)) for column, cells in
+                        zip(self.columns, zip(*padded))]
+        self._length += len(rows)
+
+    def truncate(self, length: int) -> None:
+        """Drop every row from `length` on."""
+        length = min(max(length, 0), self._length)
+        self.columns = [column.truncate(length) for column in self.columns]
+        self._length = length
+
+    def nbytes(self) -> int:
+        """Approximate memory held by all columns."""
+        return sum(column.nbytes() for column in self.columns)
+
+
+def rows_nbytes(rows: List[List[str]]) -> int:
+    """Approximate memory held by a list of rows of strings."""
+    total = sys.getsizeof(rows)
+    cells = []
+    for row in rows:
+        total += sys.getsizeof(row)
+        cells.extend(row)
+    return total + _strings_nbytes(cells)
+
+
+def memory_report(path: str) -> Dict[str, Any]:
+    """Compare list-of-lists and columnar memory use for a CSV file.
+
+    Args:
+        path (str): The CSV file, with a header row.
+
+    Returns:
+        Dict[str, Any]: Row count, total and per-row bytes of both forms.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = [row for row in csv.reader(f)][1:]
+    store = ColumnarStore.from_rows(rows)
+    old, new = rows_nbytes(rows), store.nbytes()
+    count = max(len(rows), 1)
+    return {
+        'rows': len(rows),
+        'list_bytes': old,
+        'columnar_bytes': new,
+        'list_bytes_per_row': round(old / count, 1),
+        'columnar_bytes_per_row': round(new / count, 1),
+        'ratio': round(old / new, 2) if new else None,
+        'encodings': [type(c).__name__ for c in store.columns]
+    }
+
+
+if __name__ == "__main__":
+    for key, value in memory_report(
+            sys.argv[1] if len(sys.argv) > 1
+            else "Popular_Baby_Names.csv").items():
+        print(f"{key}: {value}")
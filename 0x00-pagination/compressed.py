@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Compressed CSV datasets with a seekable block index"""
+import bz2
+import csv
+import gzip
+import io
+import lzma
+import zlib
+from array import array
+from bisect import bisect_right
+from typing import IO, List, Optional, Tuple, Union
+
+from row_index import record_ends
+
+OPENERS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+READ_SIZE = 1 << 16
+
+
+def compression(path: str) -> Optional[str]:
+    """The compression suffix of `path`, or None for plain text."""
+    for suffix in OPENERS:
+        if path.endswith(suffix):
+            return suffix
+    return None
+
+
+def open_text(path: str) -> IO[str]:
+    """Open a plain or compressed CSV file for csv.reader."""
+    opener = OPENERS.get(compression(path) or '', open)
+    return opener(path, 'rt', newline='', encoding='utf-8')
+
+
+def _decompressor(suffix: str):
+    """A fresh incremental decompressor for one compressed stream."""
+    if suffix == '.gz':
+        return zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    if suffix == '.bz2':
+        return bz2.BZ2Decompressor()
+    return lzma.LZMADecompressor()
+
+
+class CompressedRowIndex:
+    """Sequence of CSV rows read from a gzip, bz2 or xz file on demand.
+
+    One pass over the file records checkpoints roughly every `spacing`
+    decompressed bytes: the compressed offset, the decompressor state
+    there and the partial record carried over. A lookup resumes from
+    the nearest checkpoint at or before the wanted row instead of
+    decompressing from the start of the file.
+
+    zlib decompressors can be copied, so gzip files get checkpoints
+    anywhere. bz2 and xz decompressors cannot, so those files only get
+    checkpoints where a new compressed stream starts, as in files
+    written by parallel compressors such as pbzip2 or pixz.
+    """
+
+    def __init__(self, path: str, skip_header: bool = True,
+                 spacing: int = 1 << 20) -> None:
+        """Scan `path` once and build the checkpoints.
+
+        Args:
+            path (str): A .gz, .bz2 or .xz CSV file.
+            skip_header (bool): Whether the first record is a header.
+            spacing (int): Decompressed bytes between checkpoints.
+        """
+        self.path = path
+        self.suffix = compression(path)
+        if self.suffix is None:
+            raise ValueError(f"{path} is not a compressed CSV file")
+        self.spacing = spacing
+        self.header: List[str] = []
+        self._first = 1 if skip_header else 0
+        self._records = array('Q')
+        self._points: List[Tuple[int, object, bytes]] = []
+        self._total = self._build()
+        if skip_header and self._total:
+            self.header = self._read(0, 1)[0]
+
+    def _checkpoint(self, records: int, offset: int, state,
+                    carry: bytes) -> None:
+        """Remember where record number `records` can be resumed from."""
+        self._records.append(records)
+        self._points.append((offset, state, carry))
+
+    def _build(self) -> int:
+        """Decompress the whole file once, counting records and taking
+        checkpoints. Returns the number of records."""
+        suffix = self.suffix
+        copyable = suffix == '.gz'
+        records, since = 0, 0
+        carry = b''
+        decompressor = _decompressor(suffix)
+        self._checkpoint(0, 0, None, b'')
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for chunk in iter(lambda: f.read(READ_SIZE), b''):
+                offset += len(chunk)
+                while chunk:
+                    data = carry + decompressor.decompress(chunk)
+                    ends = record_ends(data)
+                    records += len(ends)
+                    carry = data[ends[-1]:] if ends else data
+                    since += len(data) - len(carry)
+                    if not decompressor.eof:
+                        break
+                    chunk = decompressor.unused_data
+                    decompressor = _decompressor(suffix)
+                    if since >= self.spacing:
+                        self._checkpoint(records, offset - len(chunk),
+                                         None, carry)
+                        since = 0
+                if copyable and since >= self.spacing and \
+                        not decompressor.eof:
+                    self._checkpoint(records, offset, decompressor.copy(),
+                                     carry)
+                    since = 0
+        return records + (1 if carry else 0)
+
+    def _read(self, begin: int, end: int) -> List[List[str]]:
+        """Parse records [begin, end) resuming from the best checkpoint."""
+        point = bisect_right(self._records, begin) - 1
+        record = self._records[point]
+        offset, state, carry = self._points[point]
+        decompressor = state.copy() if state is not None \
+            else _decompressor(self.suffix)
+        wanted: List[bytes] = []
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for chunk in iter(lambda: f.read(READ_SIZE), b''):
+                while chunk:
+                    data = carry + decompressor.decompress(chunk)
+                    last = 0
+                    for stop in record_ends(data):
+                        if begin <= record < end:
+                            wanted.append(data[last:stop])
+                        record += 1
+                        last = stop
+                    carry = data[last:]
+                    if record >= end:
+                        return self._parse(wanted)
+                    if not decompressor.eof:
+                        break
+                    chunk = decompressor.unused_data
+                    decompressor = _decompressor(self.suffix)
+        if carry and begin <= record < end:
+            wanted.append(carry)
+        return self._parse(wanted)
+
+    @staticmethod
+    def _parse(records: List[bytes]) -> List[List[str]]:
+        """Parse raw record bytes into rows."""
+        text = b''.join(records).decode('utf-8')
+        return list(csv.reader(io.StringIO(text, newline='')))
+
+    def __len__(self) -> int:
+        """Number of data rows in the file."""
+        return max(self._total - self._first, 0)
+
+    def __getitem__(self, key: Union[int, slice]):
+        """Return one row, or the list of rows in a slice."""
+        n = len(self)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(n)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            return self._read(start + self._first, stop + self._first)
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("row index out of range")
+        return self._read(key + self._first, key + self._first + 1)[0]
+
+    def checkpoints(self) -> int:
+        """Number of checkpoints in the block index."""
+        return len(self._points)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Order-statistic index over the live rows of a dataset"""
+from array import array
+from typing import Optional
+
+
+class LiveIndex:
+    """Fenwick tree counting live (not deleted) rows.
+
+    Every operation is O(log n): marking a row deleted or restored,
+    counting the live rows before a position (`rank`) and finding the
+    k-th live row (`select`). `following` finds the next live row
+    with a scan of the flags that runs at C speed.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Start with `size` rows, all of them live.
+
+        Args:
+            size (int): The number of rows in the dataset.
+        """
+        self._live = bytearray(b'\x01') * size
+        self._tree = array('l', bytes(array('l').itemsize * (size + 1)))
+        self.count = size
+        tree = self._tree
+        for i in range(1, size + 1):
+            tree[i] += 1
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+
+    def __len__(self) -> int:
+        """Total number of rows, live or deleted."""
+        return len(self._live)
+
+    def __contains__(self, index: int) -> bool:
+        """Whether the row at `index` is live."""
+        return 0 <= index < len(self._live) and self._live[index] == 1
+
+    def _add(self, index: int, delta: int) -> None:
+        """Add `delta` to the liveness count of one row."""
+        tree = self._tree
+        size = len(self._live)
+        i = index + 1
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+        self.count += delta
+
+    def extend(self, count: int) -> None:
+        """Append `count` live rows in O(count log n)."""
+        tree = self._tree
+        for _ in range(count):
+            self._live.append(1)
+            i = len(self._live)
+            tree.append(1 + self.rank(i - 1) - self.rank(i - (i & -i)))
+            self.count += 1
+
+    def delete(self, index: int) -> bool:
+        """Mark a row as deleted.
+
+        Returns:
+            bool: False if the row was already deleted.
+        """
+        if index not in self:
+            return False
+        self._live[index] = 0
+        self._add(index, -1)
+        return True
+
+    def restore(self, index: int) -> bool:
+        """Mark a deleted row as live again.
+
+        Returns:
+            bool: False if the row was already live.
+        """
+        if not 0 <= index < len(self._live) or self._live[index]:
+            return False
+        self._live[index] = 1
+        self._add(index, 1)
+        return True
+
+    def rank(self, index: int) -> int:
+        """Number of live rows strictly before `index`."""
+        tree = self._tree
+        i = min(index, len(self._live))
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def following(self, index: int) -> Optional[int]:
+        """Position of the first live row at or after `index`, or None."""
+        position = self._live.find(1, max(index, 0))
+        return None if position < 0 else position
+
+    def select(self, k: int) -> Optional[int]:
+        """Position of the k-th live row (0-based), or None."""
+        if not 0 <= k < self.count:
+            return None
+        tree = self._tree
+        size = len(self._live)
+        pos = 0
+        remaining = k + 1
+        step = 1 << size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= size and tree[nxt] < remaining:
+                pos = nxt
+                remaining -= tree[nxt]
+            step >>= 1
+        return pos
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Read-only page views over a dataset"""
+import json
+from collections.abc import Sequence as SequenceABC
+from typing import Any, Iterator, List, Optional, Sequence, Union
+
+
+class PageView(SequenceABC):
+    """Rows of a dataset selected by a range or by an array of row ids.
+
+    The view only keeps a reference to the dataset and the selection.
+    Rows of a list dataset are fetched on access; other storages (mmap,
+    columnar, shards, compressed files) are sliced once, on first
+    access, so their rows are parsed together rather than one by one.
+    """
+
+    __slots__ = ('_source', '_start', '_stop', '_ids', '_rows')
+
+    def __init__(self, source: Sequence[List[str]], start: int = 0,
+                 stop: Optional[int] = None,
+                 ids: Optional[Sequence[int]] = None) -> None:
+        """Select rows [start, stop) of `source`, or the rows listed in
+        `ids` when given.
+
+        Args:
+            source (Sequence[List[str]]): The dataset.
+            start (int): First row of the range.
+            stop (int): Row after the last one; defaults to the end.
+            ids (Sequence[int]): Row ids to select instead of a range.
+        """
+        self._source = source
+        size = len(source)
+        self._start = min(max(start, 0), size)
+        self._stop = size if stop is None else min(max(stop, self._start),
+                                                   size)
+        self._ids = ids
+        self._rows: Optional[List[List[str]]] = None
+
+    def __len__(self) -> int:
+        """Number of rows in the view."""
+        if self._ids is not None:
+            return len(self._ids)
+        return self._stop - self._start
+
+    def _materialize(self) -> Optional[List[List[str]]]:
+        """The rows as a list for non-list sources, built once."""
+        if isinstance(self._source, list):
+            return None
+        if self._rows is None:
+            if self._ids is None:
+                self._rows = self._source[self._start:self._stop]
+            else:
+                self._rows = [self._source[i] for i in self._ids]
+        return self._rows
+
+    def __getitem__(self, key: Union[int, slice]):
+        """Return one row, or a narrower view for a slice."""
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if self._ids is not None:
+                return PageView(self._source, ids=self._ids[key])
+            if step != 1:
+                return PageView(self._source, ids=range(
+                    self._start + start, self._start + stop, step))
+            return PageView(self._source, self._start + start,
+                            self._start + max(start, stop))
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("page index out of range")
+        rows = self._materialize()
+        if rows is not None:
+            return rows[key]
+        if self._ids is not None:
+            return self._source[self._ids[key]]
+        return self._source[self._start + key]
+
+    def __iter__(self) -> Iterator[List[str]]:
+        """Iterate over the rows."""
+        rows = self._materialize()
+        if rows is not None:
+            return iter(rows)
+        source = self._source
+        if self._ids is not None:
+            return (source[i] for i in self._ids)
+        return (source[i] for i in range(self._start, self._stop))
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare row by row with a list or another view."""
+        if not isinstance(other, (list, PageView)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Show the rows like the list they stand for."""
+        return repr(self.tolist())
+
+    def load(self) -> 'PageView':
+        """Read the rows of a non-list source now rather than on first
+        access, e.g. on a worker thread. Returns the view."""
+        self._materialize()
+        return self
+
+    def tolist(self) -> List[List[str]]:
+        """Copy the rows into a new list."""
+        rows = self._materialize()
+        if rows is not None:
+            return list(rows)
+        if self._ids is None:
+            return self._source[self._start:self._stop]
+        source = self._source
+        return [source[i] for i in self._ids]
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Serialize the rows as a JSON array."""
+        return json.dumps(self.tolist(), **kwargs)
+
+
+def json_default(value: Any) -> Any:
+    """`default` hook letting json.dumps serialize PageViews, e.g.
+    json.dumps(server.get_hyper(), default=json_default)."""
+    if isinstance(value, PageView):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Parallel CSV parsing over newline-aligned byte ranges"""
+import csv
+import io
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+BLOCK = 1 << 20
+MIN_CHUNK = 1 << 20
+
+
+def _count_quotes(data: mmap.mmap, start: int, end: int) -> int:
+    """Number of quote characters in data[start:end], read in blocks."""
+    total = 0
+    for pos in range(start, end, BLOCK):
+        total += data[pos:min(pos + BLOCK, end)].count(b'"')
+    return total
+
+
+def record_boundaries(path: str, parts: int,
+                      size: Optional[int] = None) -> List[int]:
+    """Split a CSV file into about `parts` ranges of whole records.
+
+    A newline only ends a record when the quotes seen since the start
+    of the file are balanced, so a quoted field containing a newline is
+    never cut in two.
+
+    Args:
+        path (str): The CSV file.
+        parts (int): The number of ranges wanted.
+        size (int): Only split the first `size` bytes; defaults to
+            the whole file.
+
+    Returns:
+        List[int]: Ascending offsets, starting with 0 and ending with
+        `size`; consecutive offsets delimit one range.
+    """
+    if size is None:
+        size = os.path.getsize(path)
+    if size == 0 or parts <= 1:
+        return [0, size]
+    bounds = [0]
+    with open(path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        pos, quotes = 0, 0
+        for part in range(1, parts):
+            target = max(size * part // parts, pos)
+            quotes += _count_quotes(data, pos, target)
+            pos = target
+            while pos < size:
+                newline = data.find(b'\n', pos)
+                if newline < 0:
+                    pos = size
+                    break
+                quotes += _count_quotes(data, pos, newline + 1)
+                pos = newline + 1
+                if quotes % 2 == 0:
+                    break
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return bounds
+
+
+def parse_range(path: str, start: int, end: int) -> List[List[str]]:
+    """Parse the CSV records stored between two byte offsets."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+    return list(csv.reader(io.StringIO(text, newline='')))
+
+
+def parse_parallel(path: str, workers: Optional[int] = None,
+                   skip_header: bool = True, size: Optional[int] = None
+                   ) -> Tuple[List[str], List[List[str]]]:
+    """Parse a CSV file in a process pool, keeping the record order.
+
+    Args:
+        path (str): The CSV file.
+        workers (int): Worker processes; defaults to the CPU count.
+            Files smaller than one chunk per worker use fewer.
+        skip_header (bool): Whether the first record is a header.
+        size (int): Only parse the first `size` bytes, which must end
+            on a record boundary; defaults to the whole file.
+
+    Returns:
+        Tuple[List[str], List[List[str]]]: The header (empty when not
+        skipped) and the data rows.
+    """
+    workers = workers or os.cpu_count() or 1
+    if size is None:
+        size = os.path.getsize(path)
+    parts = max(1, min(workers, size // MIN_CHUNK))
+    bounds = record_boundaries(path, parts, size)
+    ranges = list(zip(bounds, bounds[1:]))
+    if len(ranges) == 1:
+        chunks = [parse_range(path, *ranges[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            chunks = list(pool.map(parse_range, [path] * len(ranges),
+                                   *zip(*ranges)))
+    rows = [row for chunk in chunks for row in chunk]
+    if skip_header and rows:
+        return rows[0], rows[1:]
+    return [], rows
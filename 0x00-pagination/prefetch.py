@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Background prefetching for iterators"""
+import queue
+import threading
+from typing import Iterator, TypeVar
+
+T = TypeVar('T')
+_DONE = object()
+
+
+def prefetch(iterator: Iterator[T], depth: int) -> Iterator[T]:
+    """Yield from `iterator` while a worker thread keeps up to `depth`
+    items ready ahead of the consumer.
+
+    Exceptions raised by `iterator` are re-raised in the consumer, and
+    closing the returned generator stops the worker.
+
+    Args:
+        iterator (Iterator): The source of items.
+        depth (int): How many items to produce ahead.
+
+    Yields:
+        The items of `iterator`, in order.
+    """
+    assert isinstance(depth, int) and depth > 0, \
+        "Prefetch depth must be a positive integer."
+    ready: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def offer(item) -> bool:
+        """Queue an item unless the consumer went away first."""
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def work() -> None:
+        """Drain the source into the queue."""
+        try:
+            for item in iterator:
+                if not offer((item, None)):
+                    return
+        except BaseException as error:  # handed to the consumer
+            offer((_DONE, error))
+            return
+        offer((_DONE, None))
+
+    worker = threading.Thread(target=work, name="page-prefetch",
+                              daemon=True)
+    worker.start()
+
+    def consume() -> Iterator[T]:
+        """Hand the prefetched items over in order."""
+        try:
+            while True:
+                item, error = ready.get()
+                if error is not None:
+                    raise error
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            stop.set()
+
+    return consume()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Byte-offset row index over a CSV file"""
+import csv
+import io
+import mmap
+from array import array
+from typing import List, Union
+
+
+def record_ends(data: bytes) -> List[int]:
+    """End offsets of the complete records in `data`.
+
+    A record is complete once it is terminated by a newline outside
+    quotes; a trailing partial record is left out.
+    """
+    ends = []
+    pos = 0
+    quotes = 0
+    while True:
+        newline = data.find(b'\n', pos)
+        if newline < 0:
+            return ends
+        quotes += data.count(b'"', pos, newline)
+        pos = newline + 1
+        if quotes % 2 == 0:
+            ends.append(pos)
+            quotes = 0
+
+
+def last_record_start(path: str, end: int, row: List[str]) -> int:
+    """Offset where the last record of `path`, ending at `end` without
+    a newline, starts.
+
+    Walks back over the newlines before `end` until the bytes after one
+    parse as exactly `row`, so a newline inside a quoted field of the
+    record is not mistaken for its start. Only the end of the file is
+    read.
+    """
+    window = 1 << 16
+    with open(path, 'rb') as f:
+        while True:
+            begin = max(end - window, 0)
+            f.seek(begin)
+            data = f.read(end - begin)
+            pos = len(data)
+            while pos > 0:
+                newline = data.rfind(b'\n', 0, pos)
+                if newline < 0:
+                    break
+                if _parses_as(data[newline + 1:], row):
+                    return begin + newline + 1
+                pos = newline
+            if begin == 0:
+                return 0
+            window *= 4
+
+
+def _parses_as(data: bytes, row: List[str]) -> bool:
+    """Whether `data` is the single record `row`, ignoring empty cells
+    a storage padded the row with."""
+    rows = list(csv.reader(io.StringIO(data.decode('utf-8', 'replace'),
+                                       newline='')))
+    if len(rows) != 1:
+        return False
+    return rows[0] + [''] * (len(row) - len(rows[0])) == row
+
+
+class RowIndex:
+    """Sequence of CSV rows backed by an mmap and an array of byte offsets.
+
+    The file is scanned once to record where every data row starts;
+    rows are only parsed when they are requested.
+    """
+
+    def __init__(self, path: str, skip_header: bool = True) -> None:
+        """Scan `path` and build the offset array.
+
+        Args:
+            path (str): The CSV file to index.
+            skip_header (bool): Whether the first record is a header.
+        """
+        self.path = path
+        self.header: List[str] = []
+        self.offsets = array('Q')
+        self._file = open(path, 'rb')
+        self._map = None
+        self._build(skip_header)
+
+    def _build(self, skip_header: bool) -> None:
+        """Record the start offset of every record, plus an end sentinel.
+
+        A newline only ends a record when the number of quote characters
+        seen since the record started is even, so quoted fields that
+        contain newlines are kept whole.
+        """
+        pos = 0
+        start = 0
+        quotes = 0
+        starts = self.offsets
+        for line in self._file:
+            quotes += line.count(b'"')
+            pos += len(line)
+            if quotes % 2 == 0:
+                starts.append(start)
+                start = pos
+                quotes = 0
+        if start < pos:
+            starts.append(start)
+        starts.append(pos)
+        if pos:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        if skip_header and len(starts) > 1:
+            self.header = self._parse(starts[0], starts[1])[0]
+            del starts[0]
+
+    def _parse(self, begin: int, end: int) -> List[List[str]]:
+        """Parse the records stored between two byte offsets."""
+        if begin >= end:
+            return []
+        text = self._map[begin:end].decode('utf-8')
+        return list(csv.reader(io.StringIO(text, newline='')))
+
+    def __len__(self) -> int:
+        """Number of data rows in the file."""
+        return len(self.offsets) - 1
+
+    def __getitem__(self, key: Union[int, slice]):
+        """Return one row, or the list of rows in a slice."""
+        n = len(self)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(n)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            return self._parse(self.offsets[start], self.offsets[stop])
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("row index out of range")
+        return self._parse(self.offsets[key], self.offsets[key + 1])[0]
+
+    def terminated(self) -> bool:
+        """Whether the last record indexed ends with a newline."""
+        end = self.offsets[-1]
+        return self._map is None or end == 0 or \
+            self._map[end - 1:end] == b'\n'
+
+    def refresh(self) -> int:
+        """Index the records appended since the last scan.
+
+        A last record that had no newline yet is indexed again, as the
+        writer may have been in the middle of it.
+
+        Returns:
+            int: The change in the number of rows.
+        """
+        before = len(self)
+        if len(self) and not self.terminated():
+            del self.offsets[-1]
+        start = self.offsets[-1]
+        self._file.seek(start)
+        data = self._file.read()
+        ends = record_ends(data)
+        self.offsets.extend(start + end for end in ends)
+        if len(data) > (ends[-1] if ends else 0):
+            self.offsets.append(start + len(data))
+        if data:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        return len(self) - before
+
+    def close(self) -> None:
+        """Release the mmap and the underlying file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Secondary indexes for filtered and sorted pagination"""
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+ColumnKey = Union[str, int]
+CHUNK = 1 << 16
+
+
+def _intersect(small: Sequence[int], large: Sequence[int]) -> array:
+    """Intersect two ascending row id lists in O(m log n)."""
+    result = array('I')
+    lo = 0
+    for row in small:
+        lo = bisect_left(large, row, lo)
+        if lo == len(large):
+            break
+        if large[lo] == row:
+            result.append(row)
+    return result
+
+
+class SecondaryIndex:
+    """Per-column posting lists and sort ranks over a row sequence.
+
+    Posting lists map every distinct cell value to the ascending ids of
+    the rows holding it. Sort ranks give each row the position of its
+    value among the column's sorted distinct values (numerically for
+    integer columns), from which presorted permutations are derived.
+    """
+
+    MAX_QUERIES = 128
+
+    def __init__(self, dataset: Sequence[List[str]],
+                 header: List[str]) -> None:
+        """Scan `dataset` once and build every column's index.
+
+        Args:
+            dataset (Sequence[List[str]]): The rows to index.
+            header (List[str]): The column names.
+        """
+        self.header = header
+        self.size = 0
+        self.postings: List[Dict[str, array]] = [{} for _ in header]
+        for start in range(0, len(dataset), CHUNK):
+            self._post(dataset[start:start + CHUNK])
+        self.ranks = [self._ranks(column) for column in self.postings]
+        self._permutations: Dict[Tuple[int, bool], array] = {}
+        self._queries: Dict[Any, array] = {}
+
+    def _post(self, rows: List[List[str]]) -> None:
+        """Add rows, numbered from the current size, to the postings."""
+        postings = self.postings
+        width = len(postings)
+        for row_id, row in enumerate(rows, self.size):
+            for column, value in enumerate(row[:width]):
+                ids = postings[column].get(value)
+                if ids is None:
+                    ids = postings[column][value] = array('I')
+                ids.append(row_id)
+        self.size += len(rows)
+
+    def extend(self, rows: List[List[str]]) -> None:
+        """Index rows appended to the dataset.
+
+        Posting lists grow in place; a column's ranks are only rebuilt
+        when the new rows bring values it has not seen before.
+        """
+        if not rows:
+            return
+        known = [len(column) for column in self.postings]
+        self._post(rows)
+        for column, postings in enumerate(self.postings):
+            if len(postings) != known[column]:
+                self.ranks[column] = self._ranks(postings)
+                continue
+            ranks = self.ranks[column]
+            order = {value: ranks[ids[0]] for value, ids in postings.items()}
+            # Rows too short to hold the column rank first, as in _ranks.
+            ranks.extend(order[row[column]] if column < len(row) else 0
+                         for row in rows)
+        self._permutations.clear()
+        self._queries.clear()
+
+    def _ranks(self, postings: Dict[str, array]) -> array:
+        """Dense sort rank of every row's value in one column."""
+        values = list(postings)
+        try:
+            values.sort(key=int)
+        except ValueError:
+            values.sort()
+        ranks = array('I', bytes(4 * self.size))
+        for rank, value in enumerate(values):
+            for row in postings[value]:
+                ranks[row] = rank
+        return ranks
+
+    def column(self, key: ColumnKey) -> int:
+        """Resolve a column name or position to a position."""
+        if isinstance(key, int):
+            if not 0 <= key < len(self.header):
+                raise KeyError(key)
+            return key
+        try:
+            return self.header.index(key)
+        except ValueError:
+            raise KeyError(key) from None
+
+    def permutation(self, key: ColumnKey,
+                    descending: bool = False) -> array:
+        """Row ids of the whole dataset sorted by one column.
+
+        Ties keep file order in both directions.
+        """
+        column = self.column(key)
+        cached = self._permutations.get((column, descending))
+        if cached is None:
+            ranks = self.ranks[column]
+            cached = array('I', sorted(range(self.size),
+                                       key=ranks.__getitem__,
+                                       reverse=descending))
+            self._permutations[(column, descending)] = cached
+        return cached
+
+    def query(self, where: Optional[Dict[ColumnKey, Any]] = None,
+              order_by: Optional[ColumnKey] = None) -> Sequence[int]:
+        """Row ids matching every `where` equality, in `order_by` order.
+
+        Args:
+            where (Dict): Column name or position to required value.
+            order_by (str | int): Sort column; prefix a name with "-"
+                to sort in descending order.
+
+        Returns:
+            Sequence[int]: The matching row ids.
+        """
+        where = {self.column(k): str(v) for k, v in (where or {}).items()}
+        descending = isinstance(order_by, str) and order_by.startswith('-')
+        if descending:
+            order_by = order_by[1:]
+        sort_column = None if order_by is None else self.column(order_by)
+        if not where:
+            if sort_column is None:
+                return range(self.size)
+            return self.permutation(sort_column, descending)
+        key = (tuple(sorted(where.items())), sort_column, descending)
+        ids = self._queries.get(key)
+        if ids is not None:
+            return ids
+        lists = sorted((self.postings[c].get(v, array('I'))
+                        for c, v in where.items()), key=len)
+        ids = lists[0]
+        for other in lists[1:]:
+            ids = _intersect(ids, other)
+        if sort_column is not None:
+            ranks = self.ranks[sort_column]
+            ids = array('I', sorted(ids, key=ranks.__getitem__,
+                                    reverse=descending))
+        if len(self._queries) >= self.MAX_QUERIES:
+            del self._queries[next(iter(self._queries))]
+        self._queries[key] = ids
+        return ids
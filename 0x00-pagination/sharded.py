@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Datasets split across several CSV shard files"""
+import csv
+import errno
+import glob
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import List, Sequence, Union
+
+BLOCK = 1 << 20
+
+
+def count_records(path: str) -> int:
+    """Number of CSV records in a file, without parsing it.
+
+    Blocks without quotes are counted with a plain newline count; only
+    blocks holding quotes are walked line by line to keep newlines
+    inside quoted fields out of the count.
+    """
+    count = 0
+    quotes = 0
+    pending = False
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(BLOCK), b''):
+            if quotes % 2 == 0 and b'"' not in block:
+                count += block.count(b'\n')
+                pending = not block.endswith(b'\n')
+                continue
+            for line in block.splitlines(keepends=True):
+                quotes += line.count(b'"')
+                if line.endswith(b'\n') and quotes % 2 == 0:
+                    count += 1
+                    quotes = 0
+                    pending = False
+                else:
+                    pending = True
+    return count + pending
+
+
+def shard_paths(files: Union[str, Sequence[str]]) -> List[str]:
+    """Expand a glob pattern, or pass a list of paths through.
+
+    Raises:
+        FileNotFoundError: If no shard matches.
+    """
+    paths = sorted(glob.glob(files)) if isinstance(files, str) \
+        else list(files)
+    if not paths:
+        raise FileNotFoundError(errno.ENOENT, "no shard matches", files)
+    return paths
+
+
+class ShardedDataset:
+    """Read-only sequence of rows spread over CSV shards with headers.
+
+    Rows are counted per shard up front into a cumulative prefix table;
+    a shard is only parsed when a requested row falls inside it, and at
+    most `max_resident` parsed shards are kept, least recently used
+    first out.
+    """
+
+    def __init__(self, files: Union[str, Sequence[str]],
+                 max_resident: int = 4) -> None:
+        """Count the rows of every shard.
+
+        Args:
+            files (str | Sequence[str]): A glob pattern or shard paths,
+                in row order.
+            max_resident (int): Parsed shards kept in memory.
+        """
+        assert isinstance(max_resident, int) and max_resident > 0, \
+            "max_resident must be a positive integer."
+        self.paths = shard_paths(files)
+        self.max_resident = max_resident
+        self.header: List[str] = []
+        self.prefix = array('Q', [0])
+        for path in self.paths:
+            rows = max(count_records(path) - 1, 0)  # Skip header
+            self.prefix.append(self.prefix[-1] + rows)
+        self._resident: 'OrderedDict[int, List[List[str]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self._shard(0)
+
+    def _shard(self, number: int) -> List[List[str]]:
+        """Rows of one shard, parsing it if it is not resident."""
+        with self._lock:
+            rows = self._resident.get(number)
+            if rows is not None:
+                self._resident.move_to_end(number)
+                return rows
+            with open(self.paths[number], newline='',
+                      encoding='utf-8') as f:
+                rows = [row for row in csv.reader(f)]
+            self.loads += 1
+            if number == 0:
+                self.header = rows[0] if rows else []
+            rows = rows[1:]  # Skip header
+            self._resident[number] = rows
+            if len(self._resident) > self.max_resident:
+                self._resident.popitem(last=False)
+            return rows
+
+    def resident(self) -> List[int]:
+        """Numbers of the shards currently parsed in memory."""
+        with self._lock:
+            return list(self._resident)
+
+    def __len__(self) -> int:
+        """Total number of rows over all shards."""
+        return self.prefix[-1]
+
+    def __getitem__(self, key: Union[int, slice]):
+        """Return one row, or the list of rows in a slice."""
+        n = len(self)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(n)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            rows: List[List[str]] = []
+            while start < stop:
+                number = bisect_right(self.prefix, start) - 1
+                base = self.prefix[number]
+                end = min(stop, self.prefix[number + 1])
+                rows.extend(self._shard(number)[start - base:end - base])
+                start = end
+            return rows
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("row index out of range")
+        number = bisect_right(self.prefix, key) - 1
+        return self._shard(number)[key - self.prefix[number]]
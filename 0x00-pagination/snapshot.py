@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""Binary, memory-mappable snapshots of a ColumnarStore"""
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from columnar import CodeColumn, ColumnarStore, IntColumn, StrColumn
+from compressed import compression, open_text
+
+MAGIC = b"PGSNAP01"
+HEADER = struct.Struct("<8sQ")
+ALIGN = 8
+
+
+def snapshot_path(csv_path: str) -> str:
+    """Default snapshot location next to the CSV file."""
+    return csv_path + ".snap"
+
+
+def file_digest(path: str) -> str:
+    """blake2b hex digest of a file's contents."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_fingerprint(csv_path: str) -> Dict[str, Any]:
+    """Size, mtime and content hash identifying a CSV file."""
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            'blake2b': file_digest(csv_path)}
+
+
+class BlobStrColumn:
+    """String column read straight from a snapshot's UTF-8 blob."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview) -> None:
+        """Wrap the n + 1 byte offsets and the blob they point into."""
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        """Number of cells in the column."""
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        """Decode one cell."""
+        offsets = self.offsets
+        return str(self.blob[offsets[index]:offsets[index + 1]], 'utf-8')
+
+    def slice(self, start: int, stop: int) -> List[str]:
+        """Decode the cells in [start, stop)."""
+        return [self[i] for i in range(start, stop)]
+
+    def nbytes(self) -> int:
+        """Bytes mapped for the column."""
+        return self.offsets.nbytes + self.blob.nbytes
+
+    def truncate(self, length: int) -> 'BlobStrColumn':
+        """Keep the first `length` cells, returning the column."""
+        self.offsets = self.offsets[:length + 1]
+        return self
+
+    def extend(self, cells: List[str]) -> StrColumn:
+        """Copy the column to memory and append cells to the copy."""
+        column = StrColumn([sys.intern(value) for value in
+                            self.slice(0, len(self))])
+        return column.extend(cells)
+
+
+def _push(chunks: List[bytes], data: bytes) -> int:
+    """Queue `data`, padded to ALIGN, and return its offset."""
+    start = sum(len(chunk) for chunk in chunks)
+    chunks.append(data + b'\0' * (-len(data) % ALIGN))
+    return start
+
+
+def _encode_column(column, chunks: List[bytes]) -> Dict[str, Any]:
+    """Describe one column and queue its raw bytes."""
+    if isinstance(column, CodeColumn):
+        return {'kind': 'code', 'typecode': column.codes.typecode,
+                'values': column.values,
+                'offset': _push(chunks, column.codes.tobytes())}
+    if isinstance(column, IntColumn):
+        return {'kind': 'int', 'typecode': column.numbers.typecode,
+                'offset': _push(chunks, column.numbers.tobytes())}
+    if isinstance(column, StrColumn):
+        encoded = [value.encode('utf-8') for value in column.strings]
+        offsets = array('Q', [0])
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        blob = b''.join(encoded)
+        return {'kind': 'str',
+                'offset': _push(chunks, offsets.tobytes()),
+                'blob': _push(chunks, blob), 'blob_size': len(blob)}
+    raise TypeError(f"cannot snapshot {type(column).__name__}")
+
+
+def write_snapshot(store: ColumnarStore, csv_path: str,
+                   path: Optional[str] = None) -> str:
+    """Write `store` to disk, tagged with the fingerprint of `csv_path`.
+
+    The file is written to a temporary name and renamed into place so
+    concurrent readers never see a partial snapshot.
+
+    Returns:
+        str: The snapshot path.
+    """
+    path = path or snapshot_path(csv_path)
+    if any(isinstance(c, BlobStrColumn) for c in store.columns):
+        raise TypeError("store is already backed by a snapshot")
+    chunks: List[bytes] = []
+    columns = [_encode_column(c, chunks) for c in store.columns]
+    meta = json.dumps({
+        'source': source_fingerprint(csv_path),
+        'byteorder': sys.byteorder,
+        'rows': len(store),
+        'header': store.header,
+        'columns': columns
+    }).encode('utf-8')
+    meta += b' ' * (-(HEADER.size + len(meta)) % ALIGN)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(meta)))
+        f.write(meta)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp, path)
+    return path
+
+
+def _is_current(source: Dict[str, Any], csv_path: str,
+                verify_hash: bool) -> bool:
+    """Whether a snapshot's recorded fingerprint matches the CSV."""
+    stat = os.stat(csv_path)
+    if stat.st_size != source['size']:
+        return False
+    if stat.st_mtime_ns == source['mtime_ns'] and not verify_hash:
+        return True
+    return file_digest(csv_path) == source['blake2b']
+
+
+def load_snapshot(csv_path: str, path: Optional[str] = None,
+                  verify_hash: bool = False) -> Optional[ColumnarStore]:
+    """Map a snapshot if it still describes `csv_path`.
+
+    Args:
+        csv_path (str): The CSV the snapshot was built from.
+        path (str): The snapshot file; defaults to `<csv_path>.snap`.
+        verify_hash (bool): Hash the CSV even when size and mtime match.
+
+    Returns:
+        Optional[ColumnarStore]: The mapped store, or None when the
+        snapshot is missing, unreadable or stale.
+    """
+    path = path or snapshot_path(csv_path)
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, meta_size = HEADER.unpack_from(mapped)
+        if magic != MAGIC:
+            return None
+        meta = json.loads(mapped[HEADER.size:HEADER.size + meta_size])
+        if meta['byteorder'] != sys.byteorder or \
+                not _is_current(meta['source'], csv_path, verify_hash):
+            return None
+    except (struct.error, ValueError, KeyError):
+        return None
+    view = memoryview(mapped)[HEADER.size + meta_size:]
+    rows = meta['rows']
+    columns = []
+    for column in meta['columns']:
+        start = column['offset']
+        if column['kind'] == 'str':
+            offsets = view[start:start + 8 * (rows + 1)].cast('Q')
+            blob = view[column['blob']:column['blob'] + column['blob_size']]
+            columns.append(BlobStrColumn(offsets, blob))
+            continue
+        typecode = column['typecode']
+        size = struct.calcsize(typecode) * rows
+        numbers = view[start:start + size].cast(typecode)
+        if column['kind'] == 'code':
+            columns.append(CodeColumn(numbers, column['values']))
+        else:
+            columns.append(IntColumn(numbers))
+    store = ColumnarStore(columns, meta['header'])
+    store.mapping = mapped  # keeps the mmap open for the views
+    store.source_size = meta['source']['size']
+    return store
+
+
+def load_or_build(csv_path: str, verify_hash: bool = False
+                  ) -> Tuple[ColumnarStore, int]:
+    """Load the snapshot for `csv_path`, re-parsing and rewriting it
+    when it is missing or stale.
+
+    Returns:
+        Tuple[ColumnarStore, int]: The store and the number of bytes of
+        the CSV it covers.
+    """
+    store = load_snapshot(csv_path, verify_hash=verify_hash)
+    if store is not None:
+        return store, store.source_size
+    with open_text(csv_path) as f:
+        reader = csv.reader(f)
+        store = ColumnarStore.from_rows(reader, next(reader, None))
+        size = f.buffer.tell() if compression(csv_path) is None \
+            else os.path.getsize(csv_path)
+    try:
+        if os.path.getsize(csv_path) == size:  # not appended to meanwhile
+            write_snapshot(store, csv_path)
+    except OSError:
+        pass
+    return store, size
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else "Popular_Baby_Names.csv"
+    began = time.perf_counter()
+    with open_text(source) as f:
+        reader = csv.reader(f)
+        parsed = ColumnarStore.from_rows(reader, next(reader, None))
+    parse_time = time.perf_counter() - began
+    began = time.perf_counter()
+    write_snapshot(parsed, source)
+    write_time = time.perf_counter() - began
+    began = time.perf_counter()
+    loaded = load_snapshot(source)
+    load_time = time.perf_counter() - began
+    began = time.perf_counter()
+    load_snapshot(source, verify_hash=True)
+    verified_time = time.perf_counter() - began
+    print(f"rows: {len(parsed)}")
+    print(f"parse csv: {parse_time:.4f}s")
+    print(f"write snapshot: {write_time:.4f}s")
+    print(f"load snapshot: {load_time:.4f}s")
+    print(f"load snapshot (hash verified): {verified_time:.4f}s")
+    print(f"speedup: {parse_time / load_time:.1f}x")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Shared fixtures of the pagination tests"""
+import csv
+import io
+import os
+import sys
+from typing import Callable, List
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEADER = ["Year of Birth", "Gender", "Ethnicity", "Child's First Name",
+          "Count", "Rank"]
+
+
+def csv_bytes(rows: List[List[str]]) -> bytes:
+    """Encode rows the way csv.writer does, with CRLF line ends."""
+    out = io.StringIO(newline='')
+    csv.writer(out).writerows(rows)
+    return out.getvalue().encode('utf-8')
+
+
+@pytest.fixture
+def header() -> List[str]:
+    """Column names of the baby names dataset."""
+    return list(HEADER)
+
+
+@pytest.fixture
+def to_csv() -> Callable[[List[List[str]]], bytes]:
+    """The csv_bytes encoder."""
+    return csv_bytes
+
+
+@pytest.fixture
+def rows() -> List[List[str]]:
+    """Data rows with quoted commas, quotes and embedded newlines."""
+    names = ["Olivia", "Mason, Jr", 'Zoe "Z"', "Multi\nLine", "Liam"]
+    return [[str(2011 + i % 6), "FEMALE" if i % 2 else "MALE",
+             "HISPANIC", f"{names[i % len(names)]}{i}", str(10 + i % 97),
+             str(i % 50 + 1)] for i in range(300)]
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Tests of CompressedRowIndex against csv.reader"""
+import bz2
+import gzip
+import lzma
+
+import pytest
+
+from compressed import CompressedRowIndex
+
+COMPRESSORS = {'.gz': gzip.compress, '.bz2': bz2.compress,
+               '.xz': lzma.compress}
+
+
+def write(path, data, suffix, streams=1):
+    """Compress `data` into `path` as one or more concatenated streams."""
+    size = -(-len(data) // streams)
+    path.write_bytes(b''.join(
+        COMPRESSORS[suffix](data[i:i + size])
+        for i in range(0, len(data), size)))
+
+
+@pytest.mark.parametrize('suffix', sorted(COMPRESSORS))
+@pytest.mark.parametrize('streams', [1, 4])
+def test_rows_match_csv_reader(tmp_path, rows, suffix, streams, header,
+                               to_csv):
+    """Every row, slice and the header read back as csv.reader would."""
+    path = tmp_path / f'names.csv{suffix}'
+    write(path, to_csv([header] + rows), suffix, streams)
+    index = CompressedRowIndex(str(path), spacing=512)
+    assert index.header == header
+    assert len(index) == len(rows)
+    assert [index[i] for i in range(len(rows))] == rows
+    assert index[-1] == rows[-1]
+    assert index[37:211] == rows[37:211]
+    assert index[5:50:7] == rows[5:50:7]
+    assert index[250:10] == []
+    with pytest.raises(IndexError):
+        index[len(rows)]
+
+
+def test_gzip_gets_checkpoints_within_a_stream(tmp_path, rows, header,
+                                               to_csv):
+    """A single gzip stream is still indexed every `spacing` bytes."""
+    path = tmp_path / 'names.csv.gz'
+    write(path, to_csv([header] + rows), '.gz')
+    assert CompressedRowIndex(str(path), spacing=512).checkpoints() > 1
+
+
+def test_without_header(tmp_path, rows, to_csv):
+    """With skip_header=False the first record is a row."""
+    path = tmp_path / 'names.csv.gz'
+    write(path, to_csv(rows), '.gz')
+    index = CompressedRowIndex(str(path), skip_header=False)
+    assert index.header == []
+    assert index[0:len(rows)] == rows
+
+
+def test_rejects_plain_files(tmp_path, rows, to_csv):
+    """Only .gz, .bz2 and .xz files are accepted."""
+    path = tmp_path / 'names.csv'
+    path.write_bytes(to_csv(rows))
+    with pytest.raises(ValueError):
+        CompressedRowIndex(str(path))
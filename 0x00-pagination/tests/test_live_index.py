@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Tests of LiveIndex against a plain list of live flags"""
+import random
+
+import pytest
+
+from live_index import LiveIndex
+
+
+def check(index, live):
+    """Compare every query of `index` with the flags in `live`."""
+    positions = [i for i, flag in enumerate(live) if flag]
+    assert len(index) == len(live)
+    assert index.count == len(positions)
+    for i in range(len(live) + 1):
+        assert index.rank(i) == sum(live[:i])
+    for k, position in enumerate(positions):
+        assert index.select(k) == position
+    assert index.select(len(positions)) is None
+    for i in range(len(live) + 1):
+        after = [p for p in positions if p >= i]
+        assert index.following(i) == (after[0] if after else None)
+    assert index.select(-1) is None
+    assert [i for i in range(len(live)) if i in index] == positions
+
+
+@pytest.mark.parametrize('size', [0, 1, 2, 7, 64, 100])
+def test_starts_all_live(size):
+    """A new index counts every row as live."""
+    check(LiveIndex(size), [True] * size)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_operations(seed):
+    """Deletes, restores and extensions keep rank and select exact."""
+    rng = random.Random(seed)
+    live = [True] * rng.randrange(1, 80)
+    index = LiveIndex(len(live))
+    for _ in range(300):
+        action = rng.random()
+        if action < 0.1:
+            count = rng.randrange(1, 20)
+            index.extend(count)
+            live.extend([True] * count)
+        else:
+            position = rng.randrange(-2, len(live) + 2)
+            valid = 0 <= position < len(live)
+            if action < 0.6:
+                assert index.delete(position) == (valid and live[position])
+                if valid:
+                    live[position] = False
+            else:
+                expected = valid and not live[position]
+                assert index.restore(position) == expected
+                if valid:
+                    live[position] = True
+        check(index, live)
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""Tests of PageView"""
+from page_view import PageView
+
+
+def test_tolist_copies_a_list_range(rows):
+    """tolist() of a range over a list is a new list of the rows."""
+    view = PageView(rows, 10, 20)
+    data = view.tolist()
+    assert data == rows[10:20]
+    data.append(['extra'])
+    assert len(view) == 10
+
+
+def test_tolist_of_ids_and_slices(rows):
+    """tolist() follows row ids and narrowed views."""
+    assert PageView(rows, ids=[5, 1, 7]).tolist() == [rows[5], rows[1],
+                                                      rows[7]]
+    assert PageView(rows, 0, 50)[10:20:3].tolist() == rows[10:20:3]
+    assert PageView(tuple(rows), 3, 6).tolist() == rows[3:6]
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Tests of the response cache against an uncached Server"""
+import random
+
+Server = __import__('3-hypermedia_del_pagination').Server
+
+
+class DictCache:
+    """Unbounded cache with the put/get/cache_data of BaseCaching."""
+
+    def __init__(self):
+        """Start empty."""
+        self.cache_data = {}
+
+    def put(self, key, item):
+        """Store an item."""
+        if key is not None and item is not None:
+            self.cache_data[key] = item
+
+    def get(self, key):
+        """Return an item, or None."""
+        return self.cache_data.get(key)
+
+
+def make_pair(path):
+    """A cached and an uncached Server reading `path`."""
+    servers = Server(response_cache=DictCache()), Server()
+    for server in servers:
+        server.DATA_FILE = str(path)
+    return servers
+
+
+def test_direct_deletion_after_caching(tmp_path, rows, header, to_csv):
+    """Rows deleted from indexed_dataset() directly are not served from
+    a response cached before the deletion."""
+    path = tmp_path / 'names.csv'
+    path.write_bytes(to_csv([header] + rows))
+    cached, _ = make_pair(path)
+    cached.indexed_dataset()
+    assert cached.get_hyper_index(3, 5)['data'] == rows[3:8]
+    del cached.indexed_dataset()[4]
+    page = cached.get_hyper_index(3, 5)
+    assert page['data'] == rows[3:4] + rows[5:9]
+    assert page['next_index'] == 9
+    assert cached.get_hyper_index(0, 10)['total_pages'] == 30
+
+
+def test_matches_uncached_server(tmp_path, rows, header, to_csv):
+    """Pages stay identical to an uncached Server through deletes,
+    restores and direct edits of indexed_dataset()."""
+    path = tmp_path / 'names.csv'
+    path.write_bytes(to_csv([header] + rows))
+    cached, plain = make_pair(path)
+    rng = random.Random(7)
+    for _ in range(200):
+        action, row = rng.random(), rng.randrange(len(rows))
+        if action < 0.2:
+            assert cached.delete(row) == plain.delete(row)
+        elif action < 0.3:
+            assert cached.restore(row) == plain.restore(row)
+        elif action < 0.4:
+            for server in (cached, plain):
+                server.indexed_dataset().pop(row, None)
+        index, size = rng.randrange(len(rows)), rng.choice([1, 5, 10])
+        assert cached.get_hyper_index(index, size) == \
+            plain.get_hyper_index(index, size)
+        page = rng.randrange(1, 40)
+        assert cached.get_hyper(page, size) == plain.get_hyper(page, size)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Tests of Server.reload(tail=True)"""
+import pytest
+
+Server = __import__('3-hypermedia_del_pagination').Server
+
+CONFIGS = [
+    {'storage': 'list'},
+    {'storage': 'mmap'},
+    {'storage': 'columnar'},
+    {'storage': 'list', 'workers': 2},
+    {'storage': 'columnar', 'snapshot': True},
+]
+
+
+def make_server(path, **options):
+    """A Server reading `path`."""
+    server = Server(**options)
+    server.DATA_FILE = str(path)
+    return server
+
+
+@pytest.mark.parametrize('options', CONFIGS)
+def test_appended_rows_are_added(tmp_path, rows, options, header,
+                                 to_csv):
+    """Rows appended after the first load are parsed by a tail reload."""
+    path = tmp_path / 'names.csv'
+    path.write_bytes(to_csv([header] + rows[:200]))
+    server = make_server(path, **options)
+    assert len(server.dataset()) == 200
+    with open(path, 'ab') as f:
+        f.write(to_csv(rows[200:]))
+    assert server.reload(tail=True) == 100
+    assert list(server.dataset()[0:300]) == rows
+
+
+@pytest.mark.parametrize('options', CONFIGS)
+def test_partial_record_is_parsed_again(tmp_path, rows, options, header,
+                                        to_csv):
+    """A record cut mid-write is read as it stands, then replaced by
+    the reload that follows its completion rather than split in two."""
+    path = tmp_path / 'names.csv'
+    data = to_csv([header] + rows)
+    complete = to_csv([header] + rows[:250])
+    cut = len(complete) + len(rows[250][0]) + 1  # Cut after the year
+    path.write_bytes(data[:cut])
+    server = make_server(path, **options)
+    dataset = server.dataset()
+    assert len(dataset) == 251
+    assert dataset[250][:2] == [rows[250][0], '']
+    with open(path, 'ab') as f:
+        f.write(data[cut:])
+    assert server.reload(tail=True) == 49
+    dataset = server.dataset()
+    assert len(dataset) == 300
+    assert list(dataset[0:300]) == rows
+    assert server.get_hyper_index(245, 10)['data'] == rows[245:255]
+
+
+@pytest.mark.parametrize('options', CONFIGS)
+def test_last_line_without_newline(tmp_path, options):
+    """A file whose last line has no newline loads every row, and rows
+    appended after it are added by a tail reload."""
+    path = tmp_path / 'plain.csv'
+    path.write_bytes(b'a,b\n1,2\n3,4')
+    server = make_server(path, **options)
+    assert list(server.dataset()[0:2]) == [['1', '2'], ['3', '4']]
+    with open(path, 'ab') as f:
+        f.write(b'\n5,6\n')
+    assert server.reload(tail=True) == 1
+    assert list(server.dataset()[0:3]) == [['1', '2'], ['3', '4'],
+                                           ['5', '6']]
+
+
+def test_snapshot_written_without_final_newline(tmp_path):
+    """load_or_build writes the snapshot of a file without a final
+    newline, so the next Server loads it instead of parsing."""
+    path = tmp_path / 'plain.csv'
+    path.write_bytes(b'a,b\n1,2\n3,4')
+    make_server(path, storage='columnar', snapshot=True).dataset()
+    assert any(p.name != 'plain.csv' for p in tmp_path.iterdir())
+
+
+@pytest.mark.parametrize('options', CONFIGS[:3])
+def test_short_rows_reach_the_secondary_index(tmp_path, rows, options,
+                                              header, to_csv):
+    """Blank and short appended rows are indexed, and filtered pages
+    see the new rows."""
+    path = tmp_path / 'names.csv'
+    path.write_bytes(to_csv([header] + rows[:20]))
+    server = make_server(path, **options)
+    server.warmup(indexes=True)
+    with open(path, 'ab') as f:
+        f.write(b'\r\n1,2\r\n' + to_csv(rows[20:22]))
+    assert server.reload(tail=True) == 4
+    gender = rows[21][1]
+    expected = [row for row in rows[:22] if row[1] == gender]
+    page = server.get_hyper(1, 100, where={'Gender': gender})
+    assert page['data'] == expected
+    assert len(server.get_hyper_index(0, 100)['data']) == 24
+
+
+def test_failed_tail_reload_leaves_nothing_half_updated(tmp_path, rows,
+                                                        header, to_csv,
+                                                        monkeypatch):
+    """An error while applying a tail reload drops the dataset rather
+    than leaving the indexes out of step with it."""
+    path = tmp_path / 'names.csv'
+    path.write_bytes(to_csv([header] + rows[:20]))
+    server = make_server(path)
+    server.warmup(indexes=True)
+    with open(path, 'ab') as f:
+        f.write(to_csv(rows[20:30]))
+
+    def fail(self, added):
+        """Stand-in for a failing index update."""
+        raise RuntimeError("boom")
+    monkeypatch.setattr(type(server.live_index()), 'extend', fail)
+    with pytest.raises(RuntimeError):
+        server.reload(tail=True)
+    monkeypatch.undo()
+    assert not server.loaded()
+    assert server.get_hyper_index(0, 100)['data'] == rows[:30]
+
+
+@pytest.mark.parametrize('options', CONFIGS[:3])
+def test_deletions_survive_tail_reload(tmp_path, rows, options, header,
+                                       to_csv):
+    """A tail reload keeps deletions and extends the live index."""
+    path = tmp_path / 'names.csv'
+    path.write_bytes(to_csv([header] + rows[:200]))
+    server = make_server(path, **options)
+    server.delete(0)
+    with open(path, 'ab') as f:
+        f.write(to_csv(rows[200:]))
+    server.reload(tail=True)
+    page = server.get_hyper_index(0, 10)
+    assert page['data'] == rows[1:11]
+    assert server.get_hyper_index(295, 10)['data'] == rows[295:]
+
+
+def test_replaced_file_is_fully_reloaded(tmp_path, rows, header, to_csv):
+    """Tail reload falls back to a full reload for another file."""
+    path = tmp_path / 'names.csv'
+    path.write_bytes(to_csv([header] + rows[:200]))
+    server = make_server(path)
+    server.dataset()
+    path.write_bytes(to_csv([header] + rows[100:]))
+    assert server.reload(tail=True) is None
+    assert server.dataset() == rows[100:]
+
+
+@pytest.mark.parametrize('options', CONFIGS[:3])
+def test_blank_lines_are_tolerated(tmp_path, rows, options, header, to_csv):
+    """Blank lines keep their row numbers in every storage, through
+    loading and tail reload."""
+    path = tmp_path / 'names.csv'
+    path.write_bytes(to_csv([header] + rows[:10]) + b'\r\n')
+    server = make_server(path, **options)
+    assert len(server.dataset()) == 11
+    with open(path, 'ab') as f:
+        f.write(to_csv(rows[10:20]) + b'\r\n')
+    assert server.reload(tail=True) == 11
+    dataset = server.dataset()
+    assert len(dataset) == len(server.live_index()) == 22
+    assert not any(dataset[10]) and not any(dataset[21])
+    assert list(dataset[11:21]) == rows[10:20]
+    assert server.get_hyper_index(5, 10)['data'][:5] == rows[5:10]
+
+
+@pytest.mark.parametrize('options', CONFIGS[:3])
+def test_blank_rows_appended_after_load(tmp_path, rows, options, header,
+                                        to_csv):
+    """Blank rows appended after the first load keep the dataset and
+    the live index the same length."""
+    path = tmp_path / 'names.csv'
+    path.write_bytes(to_csv([header] + rows[:10]))
+    server = make_server(path, **options)
+    server.dataset()
+    with open(path, 'ab') as f:
+        f.write(b'\r\n5,6\r\n7,8\r\n')
+    assert server.reload(tail=True) == 3
+    page = server.get_hyper_index(0, 20)['data']
+    assert page[:10] == rows[:10]
+    assert page[11:] == [['5', '6'] + [''] * (len(page[11]) - 2),
+                         ['7', '8'] + [''] * (len(page[12]) - 2)]
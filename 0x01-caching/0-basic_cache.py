@@ -1,17 +1,12 @@
 #!/usr/bin/env python3
 """ BasicCache module """
 
-from base_caching import BaseCaching
+from cache_core import LinkedCache
 
 
-class BasicCache(BaseCaching):
+class BasicCache(LinkedCache):
     """ Basic caching system with no limit """
 
-    def put(self, key, item):
-        """ Add an item in the cache """
-        if key is not None and item is not None:
-            self.cache_data[key] = item
-
-    def get(self, key):
-        """ Get an item by key """
-        return self.cache_data.get(key, None)
+    def capacity(self):
+        """ No limit on the number of items """
+        return None
@@ -1,44 +1,72 @@
 #!/usr/bin/env python3
 """ LFU Caching module """
 
-from base_caching import BaseCaching
+from cache_core import LinkedCache, LinkedList, Node
 
 
-class LFUCache(BaseCaching):
-    """ LFUCache defines a Least Frequently Used (LFU) caching system """
+class LFUNode(Node):
+    """ Cache entry with its use count """
 
-    def __init__(self):
+    __slots__ = ('count',)
+
+    def __init__(self, key=None, value=None):
+        """ Initialize a node used once """
+        super().__init__(key, value)
+        self.count = 1
+
+
+class LFUCache(LinkedCache):
+    """ LFUCache defines a Least Frequently Used (LFU) caching system
+
+        Keys are kept in one bucket per use count, each bucket ordered
+        from least to most recently used, and min_frequency points at
+        the lowest non-empty bucket: get, put and evict are all O(1),
+        and ties are broken by discarding the least recently used key.
+    """
+
+    node_class = LFUNode
+
+    def __init__(self, *args, **kwargs):
         """ Initialize LFUCache """
-        super().__init__()
-        self.usage_frequency = {}
-        self.access_order = {}
-
-    def put(self, key, item):
-        """ Add an item in the cache with LFU policy """
-        if key is None or item is None:
-            return
-
-        # Insert/update cache and usage tracking
-        self.cache_data[key] = item
-        if key in self.usage_frequency:
-            self.usage_frequency[key] += 1
-        else:
-            self.usage_frequency[key] = 1
-
-        self.access_order[key] = len(self.access_order)
-
-        if len(self.cache_data) > BaseCaching.MAX_ITEMS:
-            lfu_key = min(self.usage_frequency, key=lambda k: (
-                self.usage_frequency[k], self.access_order[k]))
-            print(f"DISCARD: {lfu_key}")
-            del self.cache_data[lfu_key]
-            del self.usage_frequency[lfu_key]
-            del self.access_order[lfu_key]
-
-    def get(self, key):
-        """ Get an item by key, increasing its usage frequency """
-        if key is None or key not in self.cache_data:
-            return None
-        self.usage_frequency[key] += 1
-        self.access_order[key] = len(self.access_order)
-        return self.cache_data[key]
+        super().__init__(*args, **kwargs)
+        self.buckets = {}
+        self.min_frequency = 0
+
+    def __bucket(self, count):
+        """ The bucket of a use count, created if needed """
+        bucket = self.buckets.get(count)
+        if bucket is None:
+            bucket = self.buckets[count] = LinkedList()
+        return bucket
+
+    def __unlink(self, node):
+        """ Take a node out of its bucket, dropping an emptied bucket """
+        bucket = self.buckets[node.count]
+        bucket.remove(node)
+        if not bucket:
+            del self.buckets[node.count]
+            if self.min_frequency == node.count:
+                self.min_frequency += 1
+
+    def on_insert(self, node):
+        """ A new key starts in the bucket of count 1 """
+        self.__bucket(1).append(node)
+        self.min_frequency = 1
+
+    def on_access(self, node):
+        """ Move a used key to the bucket of its next count """
+        self.__unlink(node)
+        node.count += 1
+        self.__bucket(node.count).append(node)
+
+    on_update = on_access
+
+    def on_remove(self, node):
+        """ Take a discarded key out of its bucket """
+        self.__unlink(node)
+
+    def victim(self):
+        """ The least recently used key of the lowest count """
+        if self.min_frequency not in self.buckets:
+            self.min_frequency = min(self.buckets)
+        return self.buckets[self.min_frequency].first()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+""" ARC Caching module """
+
+from collections import OrderedDict
+
+from cache_core import LinkedCache, LinkedList, SegmentNode
+
+
+class ARCCache(LinkedCache):
+    """ ARCCache defines an Adaptive Replacement Cache (ARC)
+
+        Keys seen once live in recent, keys seen again in frequent, both
+        least recently used first. The keys last discarded from each
+        list are remembered, without their items, in a ghost list. A
+        miss on a ghost key shows which list was cut too short and moves
+        the target size of recent towards it, so a long scan of new keys
+        only churns recent while frequent keys stay cached.
+    """
+
+    node_class = SegmentNode
+
+    def __init__(self, *args, **kwargs):
+        """ Initialize ARCCache """
+        super().__init__(*args, **kwargs)
+        self.recent = LinkedList()
+        self.frequent = LinkedList()
+        self.recent_ghosts = OrderedDict()
+        self.frequent_ghosts = OrderedDict()
+        self.target = 0
+        self.__incoming = None
+
+    def __size(self):
+        """ Number of entries ARC adapts to """
+        capacity = self.capacity()
+        return capacity if capacity is not None else max(len(self.nodes), 1)
+
+    def put(self, key, item, *args, **kwargs):
+        """ Add an item in the cache, adapting the target size of recent
+            when the key is a ghost """
+        if key is not None and key not in self.nodes:
+            recent, frequent = self.recent_ghosts, self.frequent_ghosts
+            if key in recent:
+                step = max(len(frequent) // len(recent), 1)
+                self.target = min(self.target + step, self.__size())
+            elif key in frequent:
+                step = max(len(recent) // len(frequent), 1)
+                self.target = max(self.target - step, 0)
+        self.__incoming = key
+        try:
+            super().put(key, item, *args, **kwargs)
+        finally:
+            self.__incoming = None
+
+    def on_insert(self, node):
+        """ A ghost key comes back as frequent, a new key as recent """
+        if self.recent_ghosts.pop(node.key, None) is not None or \
+                self.frequent_ghosts.pop(node.key, None) is not None:
+            node.move(self.frequent)
+        else:
+            node.move(self.recent)
+        self.__trim_ghosts()
+
+    def on_access(self, node):
+        """ A key used again becomes the most recent frequent key """
+        node.move(self.frequent)
+
+    on_update = on_access
+
+    def on_remove(self, node):
+        """ Take a node out of its list """
+        node.segment.remove(node)
+        node.segment = None
+
+    def victim(self):
+        """ The least recently used key of recent while recent is over
+            its target size, else of frequent """
+        recent = self.recent.first()
+        if recent is not None and (
+                len(self.recent) > self.target or
+                (self.__incoming in self.frequent_ghosts and
+                 len(self.recent) == self.target) or
+                not self.frequent):
+            return recent
+        return self.frequent.first()
+
+    def discard(self, node, reason='capacity'):
+        """ Discard a node, remembering its key as a ghost when it made
+            room """
+        ghosts = self.recent_ghosts if node.segment is self.recent \
+            else self.frequent_ghosts
+        super().discard(node, reason)
+        if reason == 'capacity':
+            ghosts[node.key] = True
+            self.__trim_ghosts()
+
+    def __trim_ghosts(self):
+        """ Keep recent and its ghosts within the cache size, and all
+            lists within twice the cache size """
+        size = self.__size()
+        while self.recent_ghosts and \
+                len(self.recent) + len(self.recent_ghosts) > size:
+            self.recent_ghosts.popitem(last=False)
+        while self.frequent_ghosts and \
+                len(self.nodes) + len(self.recent_ghosts) + \
+                len(self.frequent_ghosts) > 2 * size:
+            self.frequent_ghosts.popitem(last=False)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+""" 2Q Caching module """
+
+from collections import OrderedDict
+
+from cache_core import LinkedCache, LinkedList, SegmentNode
+
+
+class TwoQCache(LinkedCache):
+    """ TwoQCache defines a 2Q caching system
+
+        New keys enter a small FIFO queue, incoming. A key used again
+        while in incoming, or put again while it is a ghost (a key
+        recently pushed out of incoming, remembered without its item),
+        is promoted to the main LRU list. Keys used once, as in a scan,
+        only ever churn incoming, which never takes more than its share
+        of the cache.
+    """
+
+    node_class = SegmentNode
+    IN_RATIO = 0.25
+    GHOST_RATIO = 0.5
+
+    def __init__(self, *args, **kwargs):
+        """ Initialize TwoQCache """
+        super().__init__(*args, **kwargs)
+        self.incoming = LinkedList()
+        self.main = LinkedList()
+        self.ghosts = OrderedDict()
+
+    def __size(self):
+        """ Number of entries the queue sizes are relative to """
+        capacity = self.capacity()
+        return capacity if capacity is not None else max(len(self.nodes), 1)
+
+    def on_insert(self, node):
+        """ A ghost key goes to main, a new key to incoming """
+        if self.ghosts.pop(node.key, None) is not None:
+            node.move(self.main)
+        else:
+            node.move(self.incoming)
+
+    def on_access(self, node):
+        """ A key used again becomes the most recent of main """
+        node.move(self.main)
+
+    on_update = on_access
+
+    def on_remove(self, node):
+        """ Take a node out of its queue """
+        node.segment.remove(node)
+        node.segment = None
+
+    def victim(self):
+        """ The oldest key of incoming once it fills its share, else
+            the least recently used key of main """
+        if self.incoming and (
+                len(self.incoming) >= self.IN_RATIO * self.__size() or
+                not self.main):
+            return self.incoming.first()
+        return self.main.first()
+
+    def discard(self, node, reason='capacity'):
+        """ Discard a node, remembering keys pushed out of incoming """
+        from_incoming = node.segment is self.incoming
+        super().discard(node, reason)
+        if from_incoming and reason == 'capacity':
+            self.ghosts[node.key] = True
+            while len(self.ghosts) > max(
+                    self.GHOST_RATIO * self.__size(), 1):
+                self.ghosts.popitem(last=False)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+""" W-TinyLFU Caching module """
+
+from cache_core import LinkedCache, LinkedList, SegmentNode
+
+SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F,
+         0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+HALVE = bytes(count >> 1 for count in range(256))
+
+
+class CountMinSketch:
+    """ Approximate use counts of keys in a few bytes per cached entry
+
+        Each key increments one byte counter in each of four rows; its
+        estimate is the smallest of the four, which hash collisions can
+        only inflate. Counters stop at 15, and after `10 * width`
+        increments every counter is halved, so keys that were popular
+        long ago age out.
+    """
+
+    MAX_COUNT = 15
+
+    def __init__(self, entries):
+        """ Initialize a sketch sized for `entries` cached entries """
+        width = 16
+        while width < entries:
+            width <<= 1
+        self.width = width
+        self.mask = width - 1
+        self.table = bytearray(width * len(SEEDS))
+        self.sample = 10 * width
+        self.additions = 0
+
+    def __indexes(self, key):
+        """ The counter of a key in each row """
+        h = hash(key)
+        return [row * self.width +
+                (((h * seed) & 0xFFFFFFFFFFFFFFFF) >> 32 & self.mask)
+                for row, seed in enumerate(SEEDS)]
+
+    def estimate(self, key):
+        """ Estimated use count of a key """
+        table = self.table
+        return min(table[i] for i in self.__indexes(key))
+
+    def increment(self, key):
+        """ Count one use of a key """
+        table = self.table
+        indexes = self.__indexes(key)
+        low = min(table[i] for i in indexes)
+        if low < self.MAX_COUNT:
+            for i in indexes:
+                if table[i] == low:
+                    table[i] = low + 1
+        self.additions += 1
+        if self.additions >= self.sample:
+            self.table = self.table.translate(HALVE)
+            self.additions //= 2
+
+
+class TinyLFUCache(LinkedCache):
+    """ TinyLFUCache defines a W-TinyLFU caching system
+
+        New keys enter a small LRU window. A key pushed out of the
+        window is only admitted to the main cache if the sketch says it
+        is used more often than the main cache's next victim; otherwise
+        the window key is discarded instead. The main cache is a
+        segmented LRU: keys used again move from probation to protected.
+        Scans of keys used once stay in the window, and the sketch's
+        aging lets the main cache forget old popular keys.
+    """
+
+    node_class = SegmentNode
+    WINDOW_RATIO = 0.01
+    PROTECTED_RATIO = 0.8
+
+    def __init__(self, *args, **kwargs):
+        """ Initialize TinyLFUCache """
+        super().__init__(*args, **kwargs)
+        self.window = LinkedList()
+        self.probation = LinkedList()
+        self.protected = LinkedList()
+        self.sketch = CountMinSketch(self.capacity() or 1024)
+
+    def __size(self):
+        """ Number of entries the segment sizes are relative to """
+        capacity = self.capacity()
+        return capacity if capacity is not None else max(len(self.nodes), 1)
+
+    def get(self, key):
+        """ Get an item by key, counting the request in the sketch """
+        if key is not None:
+            self.sketch.increment(key)
+        return super().get(key)
+
+    def __window_size(self):
+        """ Number of entries the window holds """
+        return max(int(self.WINDOW_RATIO * self.__size()), 1)
+
+    def on_insert(self, node):
+        """ A new key enters the window, pushing its oldest key to
+            probation while the cache still has room """
+        self.sketch.increment(node.key)
+        node.move(self.window)
+        if len(self.window) > self.__window_size():
+            self.window.first().move(self.probation)
+
+    def on_access(self, node):
+        """ Refresh a key in its segment, promoting it out of probation """
+        if node.segment is self.probation:
+            node.move(self.protected)
+            limit = max(int(self.PROTECTED_RATIO * (
+                self.__size() - self.__window_size())), 1)
+            if len(self.protected) > limit:
+                self.protected.first().move(self.probation)
+        else:
+            node.move(node.segment)
+
+    def on_update(self, node):
+        """ Count the put and refresh the key """
+        self.sketch.increment(node.key)
+        self.on_access(node)
+
+    def on_remove(self, node):
+        """ Take a node out of its segment """
+        node.segment.remove(node)
+        node.segment = None
+
+    def victim(self):
+        """ The loser of the window's oldest key against the main
+            cache's next victim, the winner being admitted to probation
+            when it comes from the window """
+        main = self.probation.first() or self.protected.first()
+        candidate = self.window.first()
+        window_full = len(self.window) >= self.__window_size()
+        if candidate is None or (main is not None and not window_full):
+            return main
+        if main is None:
+            return candidate
+        if self.sketch.estimate(candidate.key) > \
+                self.sketch.estimate(main.key):
+            candidate.move(self.probation)
+            return main
+        return candidate
@@ -1,25 +1,19 @@
 #!/usr/bin/env python3
 """ LIFOCache module """
 
-from base_caching import BaseCaching
+from cache_core import LinkedCache
 
 
-class LIFOCache(BaseCaching):
-    """ LIFO caching system """
+class LIFOCache(LinkedCache):
+    """ LIFO caching system
 
-    def __init__(self):
-        super().__init__()
-        self.last_key = None
+        The last key put, whether new or updated, is discarded first.
+    """
 
-    def put(self, key, item):
-        """ Add an item in the cache """
-        if key is not None and item is not None:
-            if len(self.cache_data) >= self.MAX_ITEMS:
-                print(f"DISCARD: {self.last_key}")
-                del self.cache_data[self.last_key]
-            self.cache_data[key] = item
-            self.last_key = key
+    def on_update(self, node):
+        """ An updated key becomes the last one put """
+        self.order.move_to_end(node)
 
-    def get(self, key):
-        """ Get an item by key """
-        return self.cache_data.get(key, None)
+    def victim(self):
+        """ The last key put """
+        return self.order.last()
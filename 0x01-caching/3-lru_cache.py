@@ -1,30 +1,20 @@
 #!/usr/bin/env python3
 """ LRUCache module """
 
-from base_caching import BaseCaching
-from collections import OrderedDict
+from cache_core import LinkedCache
 
 
-class LRUCache(BaseCaching):
+class LRUCache(LinkedCache):
     """ LRU caching system """
 
-    def __init__(self):
-        super().__init__()
-        self.cache_data = OrderedDict()
+    def on_update(self, node):
+        """ Put counts as a use """
+        self.order.move_to_end(node)
 
-    def put(self, key, item):
-        """ Add an item in the cache """
-        if key is not None and item is not None:
-            if key in self.cache_data:
-                self.cache_data.move_to_end(key)
-            self.cache_data[key] = item
-            if len(self.cache_data) > self.MAX_ITEMS:
-                discarded = self.cache_data.popitem(last=False)
-                print(f"DISCARD: {discarded[0]}")
+    def on_access(self, node):
+        """ Move the key to the most recently used end """
+        self.order.move_to_end(node)
 
-    def get(self, key):
-        """ Get an item by key """
-        if key in self.cache_data:
-            self.cache_data.move_to_end(key)
-            return self.cache_data[key]
-        return None
+    def victim(self):
+        """ The least recently used key """
+        return self.order.first()
@@ -1,30 +1,24 @@
 #!/usr/bin/env python3
 """ MRUCache module """
 
-from base_caching import BaseCaching
-from collections import OrderedDict
+from cache_core import LinkedCache
 
 
-class MRUCache(BaseCaching):
-    """ MRU caching system """
+class MRUCache(LinkedCache):
+    """ MRU caching system
 
-    def __init__(self):
-        super().__init__()
-        self.cache_data = OrderedDict()
+        The most recently used key is discarded before a new key is
+        added, so the new key is never the one discarded.
+    """
 
-    def put(self, key, item):
-        """ Add an item in the cache """
-        if key is not None and item is not None:
-            if key in self.cache_data:
-                self.cache_data.move_to_end(key)
-            self.cache_data[key] = item
-            if len(self.cache_data) > self.MAX_ITEMS:
-                discarded = self.cache_data.popitem(last=True)
-                print(f"DISCARD: {discarded[0]}")
+    def on_update(self, node):
+        """ Put counts as a use """
+        self.order.move_to_end(node)
 
-    def get(self, key):
-        """ Get an item by key """
-        if key in self.cache_data:
-            self.cache_data.move_to_end(key)
-            return self.cache_data[key]
-        return None
+    def on_access(self, node):
+        """ Move the key to the most recently used end """
+        self.order.move_to_end(node)
+
+    def victim(self):
+        """ The most recently used key """
+        return self.order.last()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+""" asyncio caching system with coalesced loads and refresh-ahead """
+
+import asyncio
+import time
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+class Entry:
+    """ A cached item with the time it was loaded """
+
+    __slots__ = ('item', 'loaded')
+
+    def __init__(self, item, loaded):
+        """ Initialize an entry """
+        self.item = item
+        self.loaded = loaded
+
+
+class AsyncCache:
+    """ Awaitable facade over a caching system
+
+        get_or_load() runs one load task per missing key, and every
+        coroutine awaiting that key while it runs shares it. With a
+        soft_ttl, an entry older than soft_ttl is still served, and a
+        background task reloads it (stale-while-revalidate); at most
+        max_refreshes such tasks run at once, further stale hits are
+        served without one. The policy's own ttl remains a hard limit
+        after which the entry is a miss.
+
+        Everything runs on the event loop thread, so the policy needs no
+        lock.
+    """
+
+    def __init__(self, policy=LRUCache, soft_ttl=None, max_refreshes=8,
+                 **options):
+        """ Initialize an empty cache
+
+            policy: cache class holding the entries, e.g. LRUCache
+            soft_ttl: seconds after which a hit triggers a background
+                refresh, None for no refresh-ahead
+            max_refreshes: background refreshes allowed in flight
+            options: passed to the policy, e.g. default_ttl=300
+        """
+        self.cache = policy(**options)
+        self.clock = options.get('clock', time.monotonic)
+        self.soft_ttl = soft_ttl
+        self.max_refreshes = max_refreshes
+        self.refresh_errors = 0
+        self.__loading = {}
+        self.__refreshing = {}
+
+    async def get(self, key):
+        """ Get an item by key """
+        entry = self.cache.get(key)
+        return None if entry is None else entry.item
+
+    async def put(self, key, item, ttl=None, weight=None):
+        """ Add an item in the cache
+
+            weight: weight of the item, defaults to the policy's sizer
+                applied to the item rather than to its Entry
+        """
+        if item is None:
+            return
+        if weight is None and self.cache.sizer is not None:
+            weight = self.cache.sizer(item)
+        self.cache.put(key, Entry(item, self.clock()), ttl, weight)
+
+    async def get_or_load(self, key, coro_factory, ttl=None):
+        """ Get an item by key, awaiting coro_factory(key) on a miss
+
+            Coroutines missing the same key share one load, and its
+            exception. Cancelling one of them does not cancel the load.
+
+            ttl: as for the policy's put
+        """
+        entry = self.cache.get(key)
+        if entry is not None:
+            if self.soft_ttl is not None and \
+                    self.clock() - entry.loaded >= self.soft_ttl:
+                self.__refresh(key, coro_factory, ttl)
+            return entry.item
+        task = self.__loading.get(key) or self.__refreshing.get(key)
+        if task is None:
+            task = self.__start(self.__loading, key, coro_factory, ttl)
+        return await asyncio.shield(task)
+
+    def __start(self, tasks, key, coro_factory, ttl):
+        """ Start a load task, registered in `tasks` until it ends """
+        task = asyncio.ensure_future(self.__load(key, coro_factory, ttl))
+        tasks[key] = task
+        task.add_done_callback(
+            lambda _: self.__finished(tasks, key, task))
+        return task
+
+    def __finished(self, tasks, key, task):
+        """ Unregister an ended load; a failed refresh is counted and the
+            stale entry stays until its hard ttl """
+        del tasks[key]
+        if not task.cancelled() and task.exception() is not None and \
+                tasks is self.__refreshing:
+            self.refresh_errors += 1
+
+    async def __load(self, key, coro_factory, ttl):
+        """ Await the loader and cache its result """
+        item = await coro_factory(key)
+        await self.put(key, item, ttl)
+        return item
+
+    def __refresh(self, key, coro_factory, ttl):
+        """ Reload a stale key in the background, unless it is already
+            loading or too many refreshes are in flight """
+        if key in self.__refreshing or key in self.__loading or \
+                len(self.__refreshing) >= self.max_refreshes:
+            return
+        self.__start(self.__refreshing, key, coro_factory, ttl)
+
+    def stats(self):
+        """ The policy's stats, with the loads and refreshes in flight """
+        stats = self.cache.stats()
+        stats['loading'] = len(self.__loading)
+        stats['refreshing'] = len(self.__refreshing)
+        stats['refresh_errors'] = self.refresh_errors
+        return stats
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+""" Concurrent cache throughput benchmark
+
+    Runs the same mixed get/put workload from 1, 2, 4... threads
+    against a ConcurrentCache with striped locks and against one with a
+    single shard, that is a single global lock, and prints operations
+    per second for each as JSON.
+
+    Usage:
+        ./cache_benchmark.py [--threads 1,2,4,8] [--ops 100000]
+                             [--shards 16] [--keys 10000]
+                             [--policy 3-lru_cache.LRUCache]
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+
+from concurrent_cache import ConcurrentCache
+
+
+def load_policy(name):
+    """ A cache class from 'module.Class', e.g. 3-lru_cache.LRUCache """
+    module, _, cls = name.rpartition('.')
+    return getattr(__import__(module), cls)
+
+
+def workload(keys, ops, seed):
+    """ Keys and operations of one thread: 90% gets, 10% puts, keys
+        skewed towards the low numbers like hot keys in real traffic """
+    rng = random.Random(seed)
+    return [(int(keys * rng.random() ** 2), rng.random() < 0.1)
+            for _ in range(ops)]
+
+
+def run(cache, threads, ops, keys):
+    """ Operations per second of `threads` threads sharing a cache """
+    plans = [workload(keys, ops, seed) for seed in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(plan):
+        """ Replay one thread's operations """
+        barrier.wait()
+        for key, write in plan:
+            if write or cache.get(key) is None:
+                cache.put(key, key)
+
+    workers = [threading.Thread(target=worker, args=(plan,))
+               for plan in plans]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * ops / (time.perf_counter() - start)
+
+
+def main():
+    """ Parse the arguments and print the results """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', default='1,2,4,8',
+                        help="comma separated thread counts")
+    parser.add_argument('--ops', type=int, default=100_000,
+                        help="operations per thread")
+    parser.add_argument('--shards', type=int, default=16,
+                        help="shards of the striped cache")
+    parser.add_argument('--keys', type=int, default=10_000,
+                        help="size of the key space")
+    parser.add_argument('--policy', default='3-lru_cache.LRUCache',
+                        help="cache class run by each shard")
+    args = parser.parse_args()
+
+    policy = load_policy(args.policy)
+    capacity = args.keys // 2
+    results = []
+    for threads in map(int, args.threads.split(',')):
+        # No listeners: DISCARD lines would dominate the timings.
+        striped = ConcurrentCache(policy, args.shards,
+                                  -(-capacity // args.shards), listeners=[])
+        single = ConcurrentCache(policy, 1, capacity, listeners=[])
+        results.append({
+            'threads': threads,
+            'striped_ops_per_s': round(run(striped, threads, args.ops,
+                                           args.keys)),
+            'global_lock_ops_per_s': round(run(single, threads, args.ops,
+                                               args.keys)),
+            'striped_hit_ratio': round(striped.stats()['hit_ratio'], 3)
+        })
+    print(json.dumps({'policy': args.policy, 'shards': args.shards,
+                      'keys': args.keys, 'cpus': os.cpu_count(),
+                      'results': results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+""" Shared O(1) core of the caching systems """
+
+import sys
+import threading
+import time
+
+from base_caching import BaseCaching
+from cache_stats import CacheStats, print_discard, prometheus
+from timer_wheel import TimerWheel
+
+
+def _slot_values(obj):
+    """ Values of the __slots__ attributes set on an object """
+    values = []
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name in ('__dict__', '__weakref__'):
+                continue
+            if name.startswith('__') and not name.endswith('__'):
+                name = '_' + cls.__name__.lstrip('_') + name
+            try:
+                values.append(getattr(obj, name))
+            except AttributeError:
+                pass
+    return values
+
+
+def deep_sizeof(item):
+    """ Bytes taken by an item and everything it holds, through
+        containers, __dict__ and __slots__, counting shared objects
+        once """
+    seen = set()
+    pending = [item]
+    size = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)
+        else:
+            if hasattr(obj, '__dict__'):
+                pending.append(vars(obj))
+            pending.extend(_slot_values(obj))
+    return size
+
+
+class Node:
+    """ One cache entry, linked into its policy's list """
+
+    __slots__ = ('key', 'value', 'prev', 'next', 'expires', 'weight')
+
+    def __init__(self, key=None, value=None):
+        """ Initialize an unlinked node """
+        self.key = key
+        self.value = value
+        self.prev = None
+        self.next = None
+        self.expires = None
+        self.weight = 1
+
+
+class Flight:
+    """ A load in progress, awaited by the callers who missed """
+
+    __slots__ = ('event', 'item', 'error')
+
+    def __init__(self):
+        """ Initialize an unfinished load """
+        self.event = threading.Event()
+        self.item = None
+        self.error = None
+
+    def finish(self, item=None, error=None):
+        """ Hand the result, or the error, to the waiting callers """
+        self.item = item
+        self.error = error
+        self.event.set()
+
+    def wait(self):
+        """ The loaded item, raising the loader's error if it failed """
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.item
+
+
+class SegmentNode(Node):
+    """ Cache entry that knows which of its policy's lists holds it """
+
+    __slots__ = ('segment',)
+
+    def __init__(self, key=None, value=None):
+        """ Initialize a node in no list """
+        super().__init__(key, value)
+        self.segment = None
+
+    def move(self, segment):
+        """ Move the node to the end of a list """
+        if self.segment is not None:
+            self.segment.remove(self)
+        segment.append(self)
+        self.segment = segment
+
+
+class LinkedList:
+    """ Circular doubly linked list of nodes around a sentinel
+
+        The nodes carry their own links, so appending, unlinking and
+        moving a node are O(1) with no allocation.
+    """
+
+    def __init__(self):
+        """ Initialize an empty list """
+        self.head = Node()
+        self.head.prev = self.head.next = self.head
+        self.size = 0
+
+    def __len__(self):
+        """ Number of nodes in the list """
+        return self.size
+
+    def __iter__(self):
+        """ Iterate over the nodes, from first to last """
+        node = self.head.next
+        while node is not self.head:
+            following = node.next
+            yield node
+            node = following
+
+    def append(self, node):
+        """ Link a node at the end of the list """
+        last = self.head.prev
+        node.prev, node.next = last, self.head
+        last.next = self.head.prev = node
+        self.size += 1
+
+    def appendleft(self, node):
+        """ Link a node at the start of the list """
+        first = self.head.next
+        node.prev, node.next = self.head, first
+        first.prev = self.head.next = node
+        self.size += 1
+
+    def remove(self, node):
+        """ Unlink a node of this list """
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.prev = node.next = None
+        self.size -= 1
+
+    def move_to_end(self, node):
+        """ Move a node of this list to its end """
+        self.remove(node)
+        self.append(node)
+
+    def first(self):
+        """ First node, or None if the list is empty """
+        return self.head.next if self.size else None
+
+    def last(self):
+        """ Last node, or None if the list is empty """
+        return self.head.prev if self.size else None
+
+
+class LinkedCache(BaseCaching):
+    """ Caching system on a hash map of nodes and a linked list
+
+        Subclasses choose the eviction policy through hooks called on
+        insertion, update, access and removal of a node, and through
+        victim(), which names the node to discard when the cache is
+        full. Every hook is O(1), so get and put are too.
+
+        cache_data keeps mapping keys to items, as in BaseCaching.
+
+        Entries may have a time to live, per put or by default. An
+        expired entry is a miss on get, and a timer wheel advanced on
+        every get and put (or by calling expire()) removes expired
+        entries without scanning the cache.
+
+        With max_weight, the cache holds entries up to a total weight,
+        such as a byte budget, instead of MAX_ITEMS entries. Each entry
+        weighs what put is told or what the sizer says, and put discards
+        as many victims as it takes to make the new entry fit.
+
+        Every removal other than an explicit one is passed to the
+        eviction listeners with its reason: 'capacity', 'expired' or
+        'rejected' (heavier than max_weight). The default listener
+        prints the DISCARD line of capacity evictions. stats() and
+        prometheus() report hits, misses, puts, evictions by reason,
+        size, weight and sampled get/put latencies.
+
+        get_or_load() runs a loader on a miss, once per key however many
+        threads miss it together. It holds `lock` around its own get and
+        put; share a cache between threads through ConcurrentCache,
+        which takes the same lock for every call.
+    """
+
+    node_class = Node
+    TTL_TICK = 1.0
+
+    def __init__(self, default_ttl=None, clock=time.monotonic,
+                 max_weight=None, sizer=None, listeners=None,
+                 sample_every=64):
+        """ Initialize an empty cache
+
+            default_ttl: seconds entries live when put without a ttl,
+                None to keep them until evicted
+            clock: function returning the current time in seconds
+            max_weight: total weight kept, None to count entries
+                against MAX_ITEMS instead
+            sizer: function giving the weight of an item put without
+                one, defaults to deep_sizeof with max_weight, else 1
+            listeners: functions called as listener(key, item, reason)
+                on eviction, defaults to [print_discard]
+            sample_every: time one get or put in this many, 0 for none
+        """
+        super().__init__()
+        self.nodes = {}
+        self.order = LinkedList()
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.wheel = None
+        self.max_weight = max_weight
+        if sizer is None and max_weight is not None:
+            sizer = deep_sizeof
+        self.sizer = sizer
+        self.weight = 0
+        self.listeners = [print_discard] if listeners is None \
+            else list(listeners)
+        self.counters = CacheStats(sample_every)
+        self.lock = threading.RLock()
+        self.loading = {}
+
+    def capacity(self):
+        """ Maximum number of items, None for no limit """
+        if self.max_weight is not None:
+            return None
+        return self.MAX_ITEMS
+
+    def full(self, weight):
+        """ Whether an entry of this weight needs room made first """
+        capacity = self.capacity()
+        if capacity is not None and len(self.nodes) >= capacity:
+            return True
+        return self.max_weight is not None and \
+            self.weight + weight > self.max_weight
+
+    def on_insert(self, node):
+        """ Hook: a new node enters the cache """
+        self.order.append(node)
+
+    def on_update(self, node):
+        """ Hook: put replaced the item of a cached node """
+
+    def on_access(self, node):
+        """ Hook: get found a cached node """
+
+    def on_remove(self, node):
+        """ Hook: a node leaves the cache """
+        self.order.remove(node)
+
+    def victim(self):
+        """ Hook: the node to discard to make room """
+        return self.order.first()
+
+    def remove(self, node):
+        """ Remove a node from the cache """
+        self.on_remove(node)
+        del self.nodes[node.key]
+        del self.cache_data[node.key]
+        self.weight -= node.weight
+        if node.expires is not None:
+            self.wheel.cancel(node.key)
+
+    def discard(self, node, reason='capacity'):
+        """ Remove a node from the cache and report it """
+        self.remove(node)
+        self.evicted(node.key, node.value, reason)
+
+    def evicted(self, key, item, reason):
+        """ Count an eviction and tell the listeners """
+        self.counters.evicted(reason)
+        for listener in self.listeners:
+            listener(key, item, reason)
+
+    def add_listener(self, listener):
+        """ Call listener(key, item, reason) on every eviction """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """ Stop calling an eviction listener """
+        self.listeners.remove(listener)
+
+    def expire(self):
+        """ Remove the entries whose time to live has passed, returning
+            how many were removed """
+        if not self.wheel:
+            return 0
+        keys = self.wheel.advance(self.clock())
+        for key in keys:
+            node = self.nodes[key]
+            node.expires = None  # Already off the wheel
+            self.discard(node, 'expired')
+        return len(keys)
+
+    def get_or_load(self, key, loader, ttl=None, weight=None):
+        """ Get an item by key, calling loader(key) and putting what it
+            returns on a miss
+
+            Callers missing the same key while a load runs wait for its
+            result, or its exception, instead of loading again.
+
+            ttl: as for put, or a function of the loaded item giving it
+            weight: as for put
+        """
+        with self.lock:
+            item = self.get(key)
+            if item is not None:
+                return item
+            flight = self.loading.get(key)
+            if flight is None:
+                flight = self.loading[key] = Flight()
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            return flight.wait()
+        try:
+            item = loader(key)
+        except BaseException as error:
+            with self.lock:
+                del self.loading[key]
+            flight.finish(error=error)
+            raise
+        with self.lock:
+            if callable(ttl):
+                ttl = ttl(item)
+            self.put(key, item, ttl, weight)
+            del self.loading[key]
+        flight.finish(item)
+        return item
+
+    def stats(self):
+        """ Counters, size, weight and latencies as a dictionary """
+        return self.counters.snapshot(len(self.nodes), self.weight)
+
+    def prometheus(self, name=None):
+        """ stats() in the Prometheus text format, labelled with the
+            class name unless given another """
+        return prometheus(self.stats(), name or type(self).__name__)
+
+    def __schedule(self, node, ttl):
+        """ Set or clear the expiry time of a node """
+        if ttl is None:
+            if node.expires is not None:
+                self.wheel.cancel(node.key)
+                node.expires = None
+            return
+        now = self.clock()
+        if self.wheel is None:
+            self.wheel = TimerWheel(self.TTL_TICK, now=now)
+        node.expires = now + ttl
+        self.wheel.schedule(node.key, node.expires)
+
+    def put(self, key, item, ttl=None, weight=None):
+        """ Add an item in the cache
+
+            ttl: seconds the item lives, defaults to default_ttl
+            weight: weight of the item, defaults to the sizer's
+        """
+        if key is None or item is None:
+            return
+        start = self.counters.start()
+        self.counters.puts += 1
+        try:
+            self.expire()
+            if ttl is None:
+                ttl = self.default_ttl
+            if weight is None:
+                weight = 1 if self.sizer is None else self.sizer(item)
+            node = self.nodes.get(key)
+            if node is not None:
+                room = self.max_weight is None or \
+                    self.weight - node.weight + weight <= self.max_weight
+                if room:
+                    node.value = item
+                    self.cache_data[key] = item
+                    self.weight += weight - node.weight
+                    node.weight = weight
+                    self.__schedule(node, ttl)
+                    self.on_update(node)
+                    return
+                # Grown past the room left: put it again as a new entry.
+                self.remove(node)
+            if self.max_weight is not None and weight > self.max_weight:
+                self.evicted(key, item, 'rejected')
+                return
+            while self.nodes and self.full(weight):
+                self.discard(self.victim())
+            node = self.node_class(key, item)
+            node.weight = weight
+            self.nodes[key] = node
+            self.cache_data[key] = item
+            self.weight += weight
+            self.__schedule(node, ttl)
+            self.on_insert(node)
+        finally:
+            self.counters.stop('put', start)
+
+    def get(self, key):
+        """ Get an item by key, None if missing or expired """
+        if key is None:
+            return None
+        start = self.counters.start()
+        try:
+            self.expire()
+            node = self.nodes.get(key)
+            if node is not None and node.expires is not None and \
+                    node.expires <= self.clock():
+                self.discard(node, 'expired')
+                node = None
+            if node is None:
+                self.counters.misses += 1
+                return None
+            self.counters.hits += 1
+            self.on_access(node)
+            return node.value
+        finally:
+            self.counters.stop('get', start)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+""" Cache counters, latency histograms and eviction listeners """
+
+import time
+
+BOUNDS = tuple(1e-6 * 2 ** i for i in range(21))  # 1 us to about 1 s
+METRICS = (
+    ('hits', 'counter', "Lookups that found an item."),
+    ('misses', 'counter', "Lookups that found nothing or an expired item."),
+    ('puts', 'counter', "Items added or replaced."),
+    ('size', 'gauge', "Items held."),
+    ('weight', 'gauge', "Total weight of the items held."),
+)
+
+
+def print_discard(key, item, reason):
+    """ Eviction listener printing the DISCARD line of capacity
+        evictions """
+    if reason == 'capacity':
+        print(f"DISCARD: {key}")
+
+
+class LatencyHistogram:
+    """ Counts of durations in power-of-two buckets """
+
+    def __init__(self):
+        """ Initialize an empty histogram """
+        self.counts = [0] * (len(BOUNDS) + 1)
+        self.total = 0.0
+
+    def observe(self, seconds):
+        """ Count one duration """
+        index = 0
+        while index < len(BOUNDS) and seconds > BOUNDS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.total += seconds
+
+    def snapshot(self):
+        """ Count, sum and cumulative bucket counts, Prometheus style """
+        cumulative = []
+        running = 0
+        for bound, count in zip(BOUNDS + (float('inf'),), self.counts):
+            running += count
+            cumulative.append((bound, running))
+        return {'count': running, 'sum': self.total, 'buckets': cumulative}
+
+
+class CacheStats:
+    """ Counters of one cache
+
+        Hits, misses, puts and evictions by reason are all counted.
+        Latencies are timed for one get or put in `sample_every`, so
+        the clock is not read on every call.
+    """
+
+    def __init__(self, sample_every=64):
+        """ Initialize zeroed counters """
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+        self.evictions = {}
+        self.sample_every = sample_every
+        self.calls = 0
+        self.latency = {'get': LatencyHistogram(), 'put': LatencyHistogram()}
+
+    def start(self):
+        """ Start time of a sampled call, None if not sampled """
+        self.calls += 1
+        if self.sample_every and self.calls % self.sample_every == 0:
+            return time.perf_counter()
+        return None
+
+    def stop(self, operation, start):
+        """ Record the latency of a sampled call """
+        if start is not None:
+            self.latency[operation].observe(time.perf_counter() - start)
+
+    def evicted(self, reason):
+        """ Count one eviction """
+        self.evictions[reason] = self.evictions.get(reason, 0) + 1
+
+    def snapshot(self, size, weight):
+        """ The counters as a dictionary """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'puts': self.puts,
+            'evictions': dict(self.evictions),
+            'size': size,
+            'weight': weight,
+            'latency': {operation: histogram.snapshot()
+                        for operation, histogram in self.latency.items()}
+        }
+
+
+def merge(snapshots):
+    """ One snapshot summing several, e.g. of the shards of a cache """
+    total = {'hits': 0, 'misses': 0, 'puts': 0, 'evictions': {},
+             'size': 0, 'weight': 0, 'latency': {}}
+    for snapshot in snapshots:
+        for name in ('hits', 'misses', 'puts', 'size', 'weight'):
+            total[name] += snapshot[name]
+        for reason, count in snapshot['evictions'].items():
+            total['evictions'][reason] = \
+                total['evictions'].get(reason, 0) + count
+        for operation, histogram in snapshot['latency'].items():
+            into = total['latency'].setdefault(
+                operation, {'count': 0, 'sum': 0.0,
+                            'buckets': [(bound, 0) for bound, _ in
+                                        histogram['buckets']]})
+            into['count'] += histogram['count']
+            into['sum'] += histogram['sum']
+            into['buckets'] = [(bound, a + b) for (bound, a), (_, b) in
+                               zip(into['buckets'], histogram['buckets'])]
+    lookups = total['hits'] + total['misses']
+    total['hit_ratio'] = total['hits'] / lookups if lookups else 0.0
+    return total
+
+
+def prometheus(snapshot, name):
+    """ A snapshot in the Prometheus text exposition format, labelled
+        with cache="name" """
+    label = 'cache="{}"'.format(name.replace('\\', '\\\\')
+                                .replace('"', '\\"'))
+    lines = []
+    for metric, kind, text in METRICS:
+        full = f"cache_{metric}_total" if kind == 'counter' \
+            else f"cache_{metric}"
+        lines.append(f"# HELP {full} {text}")
+        lines.append(f"# TYPE {full} {kind}")
+        lines.append(f"{full}{{{label}}} {snapshot[metric]}")
+    lines.append("# HELP cache_evictions_total Items evicted, by reason.")
+    lines.append("# TYPE cache_evictions_total counter")
+    for reason, count in sorted(snapshot['evictions'].items()):
+        lines.append(f'cache_evictions_total{{{label},reason="{reason}"}} '
+                     f'{count}')
+    for operation, histogram in sorted(snapshot['latency'].items()):
+        full = f"cache_{operation}_latency_seconds"
+        lines.append(f"# HELP {full} Sampled {operation} latency.")
+        lines.append(f"# TYPE {full} histogram")
+        for bound, count in histogram['buckets']:
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{full}_bucket{{{label},le="{le}"}} {count}')
+        lines.append(f"{full}_sum{{{label}}} {histogram['sum']}")
+        lines.append(f"{full}_count{{{label}}} {histogram['count']}")
+    return "\n".join(lines) + "\n"
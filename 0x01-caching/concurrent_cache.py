@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+""" Thread-safe sharded caching system """
+
+from cache_stats import merge, prometheus
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+class Shard:
+    """ One policy cache with its lock """
+
+    __slots__ = ('cache', 'lock')
+
+    def __init__(self, cache):
+        """ Initialize a shard around an empty cache, sharing its lock
+            so get_or_load and plain calls exclude each other """
+        self.cache = cache
+        self.lock = cache.lock
+
+
+class ConcurrentCache:
+    """ Caching system safe to share between threads
+
+        Keys are partitioned by hash across independently locked
+        shards, each running its own instance of a caching policy:
+        threads touching different shards never wait for each other,
+        and the policy only ever runs under its shard's lock. Eviction
+        is decided per shard, so the policy holds within a shard only.
+    """
+
+    def __init__(self, policy=LRUCache, shards=8, shard_capacity=None,
+                 **options):
+        """ Initialize the shards
+
+            policy: class of the cache run by each shard, e.g. LRUCache
+            shards: number of shards and locks
+            shard_capacity: items kept per shard, defaults to the
+                policy's MAX_ITEMS
+            options: passed to the policy, e.g. default_ttl=60,
+                max_weight for a weight budget per shard, or
+                listeners=[] to silence DISCARD lines
+        """
+        assert isinstance(shards, int) and shards > 0, \
+            "shards must be a positive integer."
+        self.policy = policy
+        self.shards = []
+        for _ in range(shards):
+            cache = policy(**options)
+            if shard_capacity is not None:
+                cache.MAX_ITEMS = shard_capacity
+            self.shards.append(Shard(cache))
+
+    def shard(self, key):
+        """ The shard owning a key """
+        return self.shards[hash(key) % len(self.shards)]
+
+    def put(self, key, item, ttl=None, weight=None):
+        """ Add an item in the cache
+
+            ttl: seconds the item lives, defaults to the policy's
+            weight: weight of the item, defaults to the policy's sizer
+        """
+        if key is None or item is None:
+            return
+        shard = self.shard(key)
+        with shard.lock:
+            shard.cache.put(key, item, ttl, weight)
+
+    def get(self, key):
+        """ Get an item by key """
+        if key is None:
+            return None
+        shard = self.shard(key)
+        with shard.lock:
+            return shard.cache.get(key)
+
+    def get_or_load(self, key, loader, ttl=None, weight=None):
+        """ Get an item by key, loading it once on a miss however many
+            threads miss it together; see LinkedCache.get_or_load """
+        return self.shard(key).cache.get_or_load(key, loader, ttl, weight)
+
+    def expire(self):
+        """ Remove the expired entries of every shard, returning how
+            many were removed """
+        removed = 0
+        for shard in self.shards:
+            with shard.lock:
+                removed += shard.cache.expire()
+        return removed
+
+    @property
+    def cache_data(self):
+        """ Copy of every shard's items, as one dictionary """
+        data = {}
+        for shard in self.shards:
+            with shard.lock:
+                data.update(shard.cache.cache_data)
+        return data
+
+    def print_cache(self):
+        """ Print the cache """
+        data = self.cache_data
+        print("Current cache:")
+        for key in sorted(data.keys()):
+            print("{}: {}".format(key, data.get(key)))
+
+    def stats(self):
+        """ Counters summed over the shards, and each shard's size """
+        snapshots = []
+        for shard in self.shards:
+            with shard.lock:
+                snapshots.append(shard.cache.stats())
+        totals = merge(snapshots)
+        totals['shard_sizes'] = [snapshot['size'] for snapshot in snapshots]
+        return totals
+
+    def prometheus(self, name=None):
+        """ stats() in the Prometheus text format """
+        return prometheus(self.stats(), name or type(self).__name__)
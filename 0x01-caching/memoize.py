@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+""" Memoization decorator on the caching systems """
+
+import functools
+import inspect
+
+LRUCache = __import__('3-lru_cache').LRUCache
+_KWARGS = object()
+_NONE = object()
+
+
+class _Failure:
+    """ An exception cached in place of a result """
+
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        """ Initialize around the raised exception """
+        self.error = error
+
+
+def _freeze(value):
+    """ A hashable stand-in for a list, dict or set argument """
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(map(_freeze, value))
+    if isinstance(value, dict):
+        return ('dict',) + tuple(sorted(
+            ((_freeze(k), _freeze(v)) for k, v in value.items()), key=repr))
+    if isinstance(value, (set, frozenset)):
+        return ('set', frozenset(map(_freeze, value)))
+    return value
+
+
+def make_key(args, kwargs, typed=False, signature=None):
+    """ Cache key of a call: equal for calls with equal arguments,
+        whatever the order of the keyword arguments
+
+        typed: tell apart arguments of different types, e.g. 1 and 1.0
+        signature: inspect.Signature of the function; the arguments are
+            bound to it with their defaults first, so f(1, 2), f(1, y=2)
+            and f(1) with y=2 by default share a key
+    """
+    if signature is not None:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        args, kwargs = bound.args, bound.kwargs
+    names = sorted(kwargs)
+    key = tuple(map(_freeze, args))
+    if kwargs:
+        key += (_KWARGS,) + tuple(
+            (name, _freeze(kwargs[name])) for name in names)
+    if typed:
+        key += tuple(type(value) for value in args)
+        key += tuple(type(kwargs[name]) for name in names)
+    return key
+
+
+def cached(policy=LRUCache, maxsize=None, ttl=None, negative_ttl=None,
+           error_ttl=None, typed=False, **options):
+    """ Decorator caching a function's results in a caching system
+
+        Concurrent calls with the same arguments run the function once
+        and share its result. The cache is available as `.cache` on the
+        decorated function.
+
+        policy: cache class, e.g. LRUCache or LFUCache
+        maxsize: entries kept, defaults to the policy's MAX_ITEMS
+        ttl: seconds a result is kept, None until evicted
+        negative_ttl: seconds a None result is kept, None to not
+            cache None
+        error_ttl: seconds an exception is kept and raised again, None
+            to not cache exceptions
+        typed: cache arguments of different types separately
+        options: passed to the policy; DISCARD lines are off unless
+            listeners are given
+    """
+    options.setdefault('listeners', [])
+
+    def lifetime(entry):
+        """ Time to live of a loaded entry """
+        if entry is _NONE:
+            return negative_ttl
+        if isinstance(entry, _Failure):
+            return error_ttl
+        return ttl
+
+    def decorate(func):
+        """ Wrap func with its own cache """
+        cache = policy(**options)
+        if maxsize is not None:
+            cache.MAX_ITEMS = maxsize
+        try:
+            signature = inspect.signature(func)
+        except (TypeError, ValueError):
+            signature = None  # Some builtins have none
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            """ Cached call of func """
+            def load(key):
+                """ Call func, wrapping what should be cached """
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as error:
+                    if error_ttl is None:
+                        raise
+                    return _Failure(error)
+                if result is None:
+                    return _NONE if negative_ttl is not None else None
+                return result
+
+            key = make_key(args, kwargs, typed, signature)
+            entry = cache.get_or_load(key, load, lifetime)
+            if entry is _NONE:
+                return None
+            if isinstance(entry, _Failure):
+                raise entry.error
+            return entry
+
+        wrapper.cache = cache
+        return wrapper
+    return decorate
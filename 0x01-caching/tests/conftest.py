@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+""" Puts the caching modules on the import path of the tests
+
+    base_caching.py is provided by the project checker, not this
+    repository; when it is missing, a stand-in with the same interface
+    is registered so the caches can still be imported.
+"""
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import base_caching  # noqa: F401
+except ImportError:
+    class BaseCaching():
+        """ Stand-in for the checker's BaseCaching """
+        MAX_ITEMS = 4
+
+        def __init__(self):
+            """ Initialize """
+            self.cache_data = {}
+
+        def print_cache(self):
+            """ Print the cache """
+            print("Current cache:")
+            for key in sorted(self.cache_data.keys()):
+                print("{}: {}".format(key, self.cache_data.get(key)))
+
+        def put(self, key, item):
+            """ Add an item in the cache """
+            raise NotImplementedError(
+                "put must be implemented in your cache class")
+
+        def get(self, key):
+            """ Get an item by key """
+            raise NotImplementedError(
+                "get must be implemented in your cache class")
+
+    base_caching = types.ModuleType('base_caching')
+    base_caching.BaseCaching = BaseCaching
+    sys.modules['base_caching'] = base_caching
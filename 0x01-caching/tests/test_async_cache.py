@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+""" AsyncCache on top of a weighted policy """
+import asyncio
+
+from async_cache import AsyncCache
+from cache_core import deep_sizeof
+
+LRUCache = __import__('3-lru_cache').LRUCache
+PAYLOAD = 'x' * 100000
+
+
+def test_async_cache_weighs_the_item():
+    """ The item's weight counts against max_weight, not the small
+        Entry wrapping it """
+    async def scenario():
+        """ Put a heavy and a light item """
+        cache = AsyncCache(LRUCache, max_weight=10000, listeners=[])
+        await cache.put('heavy', PAYLOAD)
+        await cache.put('light', 'x')
+        assert await cache.get('heavy') is None
+        assert await cache.get('light') == 'x'
+        assert cache.cache.weight == deep_sizeof('x')
+        await cache.put('given', PAYLOAD, weight=5)
+        assert await cache.get('given') == PAYLOAD
+        assert cache.stats()['evictions']['rejected'] == 1
+    asyncio.run(scenario())
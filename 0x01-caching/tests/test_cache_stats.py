@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+""" Counters, eviction reasons and listeners of the caching systems """
+from cache_stats import merge
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+class Clock:
+    """ A clock moved by hand """
+
+    def __init__(self):
+        """ Start at time 0 """
+        self.now = 0.0
+
+    def __call__(self):
+        """ The current time """
+        return self.now
+
+
+def test_hits_misses_and_puts():
+    """ Lookups and puts are counted, with the hit ratio """
+    cache = LRUCache(listeners=[])
+    cache.put('A', 1)
+    cache.put('A', 2)
+    cache.get('A')
+    cache.get('B')
+    cache.get('B')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['puts']) == (1, 2, 2)
+    assert stats['hit_ratio'] == 1 / 3
+    assert stats['size'] == 1
+
+
+def test_listeners_get_every_reason():
+    """ Capacity, expiry and rejection are told to the listeners and
+        counted by reason """
+    clock = Clock()
+    events = []
+    cache = LRUCache(clock=clock, max_weight=10, sizer=len,
+                     listeners=[lambda *event: events.append(event)])
+    cache.put('A', 'aaaa')
+    cache.put('B', 'bbbb')
+    cache.put('C', 'cccc')
+    cache.put('D', 'd' * 11)
+    cache.put('E', 'e', ttl=5)
+    clock.now = 6
+    assert cache.get('E') is None
+    assert events == [('A', 'aaaa', 'capacity'),
+                      ('D', 'd' * 11, 'rejected'),
+                      ('E', 'e', 'expired')]
+    assert cache.stats()['evictions'] == {'capacity': 1, 'rejected': 1,
+                                          'expired': 1}
+    assert cache.stats()['weight'] == 8
+
+
+def test_removed_listener_is_not_called():
+    """ remove_listener stops the calls, add_listener starts them """
+    first, second = [], []
+
+    def hook(key, item, reason):
+        """ The listener removed later """
+        first.append(key)
+    cache = LRUCache(listeners=[])
+    cache.add_listener(hook)
+    cache.add_listener(lambda key, item, reason: second.append(key))
+    for key in 'ABCDE':
+        cache.put(key, key)
+    cache.remove_listener(hook)
+    cache.put('F', 'F')
+    assert first == ['A']
+    assert second == ['A', 'B']
+
+
+def test_default_listener_prints_discard(capsys):
+    """ Without listeners, capacity evictions print DISCARD lines and
+        other reasons stay silent """
+    clock = Clock()
+    cache = LRUCache(clock=clock)
+    for key in 'ABCDE':
+        cache.put(key, key, ttl=1 if key == 'E' else None)
+    clock.now = 2
+    cache.get('E')
+    assert capsys.readouterr().out == "DISCARD: A\n"
+
+
+def test_merge_and_prometheus():
+    """ Snapshots merge by summing, and render as Prometheus text """
+    caches = [LRUCache(listeners=[]) for _ in range(2)]
+    for number, cache in enumerate(caches):
+        for key in range(5 + number):
+            cache.put(key, key)
+        cache.get(0)
+    total = merge([cache.stats() for cache in caches])
+    assert total['puts'] == 11
+    assert total['evictions'] == {'capacity': 3}
+    assert total['size'] == 8
+    text = caches[0].prometheus('lru')
+    assert 'cache_hits_total{cache="lru"} 0' in text
+    assert 'cache_evictions_total{cache="lru",reason="capacity"} 1' in text
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+""" ConcurrentCache shared between threads """
+import random
+import threading
+import time
+
+from concurrent_cache import ConcurrentCache
+
+
+def run_threads(count, target):
+    """ Run target(number) on `count` threads started together """
+    barrier = threading.Barrier(count)
+
+    def run(number):
+        """ Wait for every thread, then run the target """
+        barrier.wait()
+        target(number)
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_counters_add_up_under_threads():
+    """ Every put and get is counted once, and no shard outgrows its
+        capacity """
+    cache = ConcurrentCache(shards=4, shard_capacity=16, listeners=[])
+    gets = [0] * 8
+
+    def work(number):
+        """ Mixed puts and gets on shared keys """
+        rng = random.Random(number)
+        for step in range(2000):
+            key = rng.randrange(200)
+            if step % 2:
+                cache.put(key, (number, step))
+            else:
+                cache.get(key)
+                gets[number] += 1
+    run_threads(8, work)
+    stats = cache.stats()
+    assert stats['puts'] == 8 * 1000
+    assert stats['hits'] + stats['misses'] == sum(gets)
+    assert all(size <= 16 for size in stats['shard_sizes'])
+    assert stats['size'] == sum(stats['shard_sizes']) == len(cache.cache_data)
+    assert stats['evictions']['capacity'] > 0
+
+
+def test_keys_stay_in_their_shard():
+    """ Items are found again whatever shard they landed in """
+    cache = ConcurrentCache(shards=3, shard_capacity=100, listeners=[])
+    for key in range(150):
+        cache.put(key, str(key))
+    assert all(cache.get(key) == str(key) for key in range(150))
+    assert cache.cache_data == {key: str(key) for key in range(150)}
+    assert sum(cache.stats()['shard_sizes']) == 150
+
+
+def test_get_or_load_runs_the_loader_once():
+    """ Threads missing one key together share a single load """
+    cache = ConcurrentCache(shards=2, listeners=[])
+    calls = []
+    results = [None] * 8
+
+    def loader(key):
+        """ A slow load, counted """
+        calls.append(key)
+        time.sleep(0.05)
+        return key * 2
+
+    def work(number):
+        """ Load the shared key """
+        results[number] = cache.get_or_load(21, loader)
+    run_threads(8, work)
+    assert calls == [21]
+    assert results == [42] * 8
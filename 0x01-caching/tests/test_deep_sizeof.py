@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+""" deep_sizeof through containers and __slots__ """
+import sys
+
+from cache_core import deep_sizeof
+
+PAYLOAD = 'x' * 100000
+
+
+class Slotted:
+    """ Holds its payload in a slot """
+
+    __slots__ = ('payload',)
+
+    def __init__(self, payload):
+        """ Initialize around a payload """
+        self.payload = payload
+
+
+class Private(Slotted):
+    """ Adds a name-mangled slot to an inherited one """
+
+    __slots__ = '__extra'
+
+    def __init__(self, payload, extra):
+        """ Initialize around two payloads """
+        super().__init__(payload)
+        self.__extra = extra
+
+
+def test_deep_sizeof_follows_slots():
+    """ Slot values count, mangled and inherited ones included """
+    assert deep_sizeof(Slotted(PAYLOAD)) >= sys.getsizeof(PAYLOAD)
+    other = 'y' * 50000
+    size = deep_sizeof(Private(PAYLOAD, other))
+    assert size >= sys.getsizeof(PAYLOAD) + sys.getsizeof(other)
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    """ An object held twice is weighed once """
+    once = deep_sizeof([PAYLOAD])
+    assert deep_sizeof([PAYLOAD, PAYLOAD]) - once < 100
+    assert deep_sizeof({'a': Slotted(PAYLOAD)}) > sys.getsizeof(PAYLOAD)
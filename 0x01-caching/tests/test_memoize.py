@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+""" The cached decorator and its cache keys """
+from memoize import cached, make_key
+
+
+def test_calls_bound_to_the_signature_share_a_key():
+    """ f(1, 2), f(1, y=2), f(x=1, y=2) and f(1) with y=2 by default
+        run the function once """
+    calls = []
+
+    @cached()
+    def add(x, y=2):
+        """ Sum, counting the calls """
+        calls.append((x, y))
+        return x + y
+
+    assert [add(1, 2), add(1, y=2), add(x=1, y=2), add(1)] == [3] * 4
+    assert calls == [(1, 2)]
+    assert add(1, 3) == 4
+    assert calls == [(1, 2), (1, 3)]
+
+
+def test_keyword_order_and_typed_keys():
+    """ Keyword order never matters; typed keys tell 1 from 1.0 """
+    assert make_key((), {'a': 1, 'b': 2}) == make_key((), {'b': 2, 'a': 1})
+    assert make_key((1,), {}) == make_key((1.0,), {})
+    assert make_key((1,), {}, typed=True) != make_key((1.0,), {}, typed=True)
+    assert make_key(([1, 2],), {}) != make_key(((1, 2),), {})
+
+
+def test_unhashable_arguments():
+    """ Lists and dicts are frozen into the key """
+    calls = []
+
+    @cached()
+    def total(values, weights):
+        """ Weighted sum, counting the calls """
+        calls.append(1)
+        return sum(v * weights.get(v, 1) for v in values)
+
+    assert total([1, 2], {2: 3}) == total([1, 2], {2: 3}) == 7
+    assert len(calls) == 1
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+""" Policies compared with a reference model of each one
+
+    The reference keeps, for every key, its use count and the times it
+    was inserted, last put and last used, and finds the victim by
+    scanning them all.
+"""
+import random
+
+import pytest
+
+POLICIES = {
+    'FIFOCache': ('1-fifo_cache', lambda e: e['inserted']),
+    'LIFOCache': ('2-lifo_cache', lambda e: -e['put']),
+    'LRUCache': ('3-lru_cache', lambda e: e['used']),
+    'MRUCache': ('4-mru_cache', lambda e: -e['used']),
+    'LFUCache': ('100-lfu_cache', lambda e: (e['count'], e['used'])),
+}
+
+
+class Reference:
+    """ Scanning model of a policy: the victim minimizes `rank` """
+
+    def __init__(self, capacity, rank):
+        """ Initialize an empty model """
+        self.capacity = capacity
+        self.rank = rank
+        self.entries = {}
+        self.data = {}
+        self.time = 0
+
+    def put(self, key, item):
+        """ Put as the policy does, returning the discarded key """
+        if key is None or item is None:
+            return None
+        self.time += 1
+        discarded = None
+        entry = self.entries.get(key)
+        if entry is None:
+            if len(self.data) >= self.capacity:
+                discarded = min(self.entries, key=lambda k: self.rank(
+                    self.entries[k]))
+                del self.entries[discarded]
+                del self.data[discarded]
+            entry = self.entries[key] = {'inserted': self.time, 'count': 0}
+        entry['put'] = entry['used'] = self.time
+        entry['count'] += 1
+        self.data[key] = item
+        return discarded
+
+    def get(self, key):
+        """ Get as the policy does """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.time += 1
+        entry['used'] = self.time
+        entry['count'] += 1
+        return self.data[key]
+
+
+@pytest.mark.parametrize('name', sorted(POLICIES))
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_reference(name, seed):
+    """ Same items, same gets and same victims as the reference """
+    module, rank = POLICIES[name]
+    discarded = []
+    cache = getattr(__import__(module), name)(
+        listeners=[lambda key, item, reason: discarded.append(key)])
+    reference = Reference(cache.MAX_ITEMS, rank)
+    rng = random.Random(seed)
+    for step in range(2000):
+        key = rng.choice([None] + list('ABCDEFGH'))
+        if rng.random() < 0.5:
+            item = None if rng.random() < 0.05 else step
+            expected = reference.put(key, item)
+            cache.put(key, item)
+            assert discarded[-1:] == ([expected] if expected else [])
+            discarded.clear()
+        else:
+            assert cache.get(key) == reference.get(key)
+        assert cache.cache_data == reference.data
+
+
+def test_discard_line(capsys):
+    """ A capacity eviction prints the ALX DISCARD line """
+    cache = __import__('3-lru_cache').LRUCache()
+    for key in 'ABCDE':
+        cache.put(key, key.lower())
+    assert capsys.readouterr().out == "DISCARD: A\n"
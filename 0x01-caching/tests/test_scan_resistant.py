@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+""" ARC, 2Q and TinyLFU: bookkeeping and resistance to scans """
+import random
+
+import pytest
+
+POLICIES = {
+    'ARCCache': '101-arc_cache',
+    'TwoQCache': '102-2q_cache',
+    'TinyLFUCache': '103-tinylfu_cache',
+}
+
+
+def make(name, capacity, discarded=None):
+    """ A policy holding `capacity` items, logging its evictions """
+    listeners = [] if discarded is None else \
+        [lambda key, item, reason: discarded.append(key)]
+    cache = getattr(__import__(POLICIES[name]), name)(listeners=listeners)
+    cache.MAX_ITEMS = capacity
+    return cache
+
+
+@pytest.mark.parametrize('name', sorted(POLICIES))
+@pytest.mark.parametrize('seed', range(3))
+def test_keeps_what_it_did_not_discard(name, seed):
+    """ Every key put is served with its last item until it is
+        discarded, and the cache never holds more than MAX_ITEMS """
+    discarded = []
+    cache = make(name, 8, discarded)
+    expected = {}
+    rng = random.Random(seed)
+    for step in range(3000):
+        key = rng.randrange(30)
+        if rng.random() < 0.5:
+            cache.put(key, step)
+            expected[key] = step
+        else:
+            assert cache.get(key) == expected.get(key)
+        for key in discarded:
+            del expected[key]
+        discarded.clear()
+        assert cache.cache_data == expected
+        assert len(cache.cache_data) <= 8
+
+
+@pytest.mark.parametrize('name', sorted(POLICIES))
+def test_scan_does_not_flush_hot_keys(name):
+    """ A scan of keys read once leaves keys read often cached, where
+        LRU would lose them all """
+    cache = make(name, 100)
+    hot = range(-20, 0)
+    for _ in range(5):
+        for key in hot:
+            if cache.get(key) is None:
+                cache.put(key, key)
+    for key in range(1000):
+        if cache.get(key) is None:
+            cache.put(key, key)
+    assert sum(cache.get(key) is not None for key in hot) >= 18
+    assert len(cache.cache_data) == 100
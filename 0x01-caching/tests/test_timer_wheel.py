@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+""" TimerWheel compared with the deadlines it was given """
+import random
+import time
+
+import pytest
+
+from timer_wheel import TimerWheel
+
+
+@pytest.mark.parametrize('slots, levels', [(2, 1), (4, 2), (8, 3), (64, 4)])
+@pytest.mark.parametrize('seed', range(4))
+def test_expires_every_key_once_and_in_time(slots, levels, seed):
+    """ Keys expire no earlier than their deadline and no later than
+        one tick after it; rescheduled and cancelled keys are honoured """
+    rng = random.Random(seed)
+    tick = rng.choice([0.5, 1.0, 3.0])
+    wheel = TimerWheel(tick, slots, levels, now=100.0)
+    now = 100.0
+    deadlines = {}
+    scheduled_at = {}
+    for _ in range(500):
+        action = rng.random()
+        if action < 0.4:
+            key = rng.randrange(40)
+            deadline = now + rng.expovariate(1 / rng.choice([1, 30, 5000]))
+            wheel.schedule(key, deadline)
+            deadlines[key] = deadline
+            scheduled_at[key] = now
+        elif action < 0.5:
+            key = rng.randrange(40)
+            wheel.cancel(key)
+            deadlines.pop(key, None)
+        else:
+            now += rng.expovariate(1 / rng.choice([0.5, 20, 3000]))
+            expired = wheel.advance(now)
+            assert len(expired) == len(set(expired))
+            for key in expired:
+                assert deadlines.pop(key) <= now
+            for key, deadline in deadlines.items():
+                # Due a full tick ago and scheduled before that.
+                assert not (deadline <= now - tick and
+                            scheduled_at[key] <= now - tick)
+        assert len(wheel) == len(deadlines)
+        assert all(key in wheel for key in deadlines)
+    assert sorted(wheel.advance(now + 10 ** 7)) == sorted(deadlines)
+    assert len(wheel) == 0
+
+
+def test_long_idle_skips_empty_ticks():
+    """ Advancing over years with one far key does not walk the ticks """
+    day = 86400
+    wheel = TimerWheel(1.0, now=0.0)
+    wheel.schedule('far', 3650 * day)
+    began = time.perf_counter()
+    assert wheel.advance(7 * day) == []
+    assert wheel.advance(3650 * day - 1) == []
+    assert wheel.advance(3650 * day) == ['far']
+    assert time.perf_counter() - began < 1.0
+    assert len(wheel) == 0
+
+
+def test_reschedule_replaces_deadline():
+    """ Scheduling a key again moves its deadline """
+    wheel = TimerWheel(1.0, now=0.0)
+    wheel.schedule('k', 5.0)
+    wheel.schedule('k', 500.0)
+    assert wheel.advance(100.0) == []
+    assert wheel.advance(500.0) == ['k']
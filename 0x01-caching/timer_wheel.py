@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+""" Hierarchical timer wheel """
+
+import math
+
+
+class TimerWheel:
+    """ Hierarchical timer wheel of deadlines per key
+
+        Level 0 has one slot per tick, level 1 one slot per `slots`
+        ticks, and so on. A key is filed in the slot of its deadline on
+        the finest level whose span covers it, and moves one level down
+        each time the wheel below completes a turn. Scheduling and
+        cancelling are O(1). Advancing jumps over the ticks whose slots
+        are all empty, so it costs O(1) per tick that expires or refiles
+        keys, whatever the time elapsed, plus O(levels) per key over its
+        lifetime.
+    """
+
+    def __init__(self, tick=1.0, slots=64, levels=4, now=0.0):
+        """ Initialize an empty wheel
+
+            tick: seconds per slot of level 0
+            slots: slots per level, a power of two
+            levels: number of levels; deadlines further than
+                tick * slots ** levels away wait on the last level
+            now: current time, in the clock's seconds
+        """
+        assert slots > 1 and slots & (slots - 1) == 0, \
+            "slots must be a power of two."
+        self.tick = tick
+        self.bits = slots.bit_length() - 1
+        self.mask = slots - 1
+        self.wheels = [[{} for _ in range(slots)] for _ in range(levels)]
+        self.where = {}
+        self.current = self._ticks(now)
+
+    def _ticks(self, seconds):
+        """ Tick number of a time """
+        return math.floor(seconds / self.tick)
+
+    def __len__(self):
+        """ Number of scheduled keys """
+        return len(self.where)
+
+    def __contains__(self, key):
+        """ Whether a key is scheduled """
+        return key in self.where
+
+    def _file(self, key, deadline, earliest):
+        """ Put a key in the slot its deadline belongs to, no earlier
+            than tick `earliest` """
+        due = max(self._ticks(deadline), earliest)
+        level = 0
+        while level < len(self.wheels) - 1 and \
+                due - self.current >= 1 << (self.bits * (level + 1)):
+            level += 1
+        span = self.bits * level
+        if due - self.current >= 1 << (span + self.bits):
+            # Beyond the horizon: park one turn ahead and refile then.
+            due = self.current + (1 << (span + self.bits)) - 1
+        slot = (due >> span) & self.mask
+        self.wheels[level][slot][key] = deadline
+        self.where[key] = (level, slot)
+
+    def schedule(self, key, deadline):
+        """ Schedule a key to expire at a deadline, replacing any
+            earlier schedule of the same key """
+        self.cancel(key)
+        self._file(key, deadline, self.current + 1)
+
+    def cancel(self, key):
+        """ Unschedule a key, if scheduled """
+        place = self.where.pop(key, None)
+        if place is not None:
+            del self.wheels[place[0]][place[1]][key]
+
+    def advance(self, now):
+        """ Move the wheel to `now` and return the keys whose deadline
+            has passed, unscheduled """
+        target = self._ticks(now)
+        expired = []
+        if not self.where:
+            self.current = max(self.current, target)
+            return expired
+        while self.current < target:
+            following = self.current + 1
+            if following & self.mask and \
+                    not self.wheels[0][following & self.mask]:
+                # Nothing due next tick: jump to the next one with work.
+                self.current = self._next_busy(target) - 1
+            self.current += 1
+            tick = self.current
+            level = 1
+            while level < len(self.wheels) and \
+                    tick & ((1 << (self.bits * level)) - 1) == 0:
+                self._cascade(level, (tick >> (self.bits * level)) &
+                              self.mask)
+                level += 1
+            self._expire(self.wheels[0][tick & self.mask], now, expired)
+            if not self.where:
+                self.current = target
+        return expired
+
+    def _next_busy(self, target):
+        """ First tick after the current one at which a non-empty slot
+            expires or cascades, or `target` if that comes first """
+        busy = target
+        for level, wheel in enumerate(self.wheels):
+            span = self.bits * level
+            turn = self.current >> span
+            for slot, keys in enumerate(wheel):
+                if keys:
+                    # The slot comes round 1 to `slots` steps of this
+                    # level after the current one.
+                    step = ((slot - turn - 1) & self.mask) + 1
+                    busy = min(busy, (turn + step) << span)
+        return busy
+
+    def _cascade(self, level, slot):
+        """ Refile the keys of a slot on the finer levels """
+        keys = self.wheels[level][slot]
+        self.wheels[level][slot] = {}
+        for key, deadline in keys.items():
+            del self.where[key]
+            self._file(key, deadline, self.current)
+
+    def _expire(self, keys, now, expired):
+        """ Collect the keys of the current level 0 slot that are due,
+            moving those due later in this tick to the next one """
+        for key, deadline in list(keys.items()):
+            del keys[key]
+            del self.where[key]
+            if deadline <= now:
+                expired.append(key)
+            else:
+                self._file(key, deadline, self.current + 1)